@@ -1,33 +1,65 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 from database import get_db, User
+import hashlib
 import os
+import threading
+import time
 
 # Security settings
 SECRET_KEY = "your-secret-key-here-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30  # Restored to 30 minutes
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__min_rounds=12)
+# Minimum-cost hasher for seed data; those hashes are upgraded on first login
+seed_pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Verified tokens -> (valid until, user column snapshot), so repeated requests with the
+# same token skip both the JWT decode and the user SELECT. The cache is per process:
+# with several workers, another worker can serve stale account state for up to the TTL
+TOKEN_CACHE_TTL_SECONDS = 60
+TOKEN_CACHE_MAX_SIZE = 10_000
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+_user_columns = [column.key for column in User.__table__.columns]
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+@lru_cache(maxsize=32)
+def get_seed_password_hash(password):
+    """Hash a password for seed/bootstrap users with the minimum bcrypt cost (memoized per password)"""
+    return seed_pwd_context.hash(password)
+
 def authenticate_user(db: Session, username: str, password: str):
     user = db.query(User).filter(User.username == username).first()
     if not user:
+        # Spend the same bcrypt time as a real check so unknown usernames can't be
+        # told apart by response time
+        pwd_context.dummy_verify()
         return False
-    if not verify_password(password, user.hashed_password):
+    # End the read so the pooled connection isn't held while bcrypt runs; loaded
+    # attributes survive the commit (expire_on_commit=False)
+    db.commit()
+    valid, new_hash = pwd_context.verify_and_update(password, user.hashed_password)
+    if not valid:
         return False
+    if new_hash:
+        # Re-hash seed passwords at production cost once the plain password is known
+        user.hashed_password = new_hash
+        db.commit()
     return user
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -40,7 +72,47 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def _token_cache_key(token: str) -> str:
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+def _get_cached_user(token_key: str, db: Session):
+    with _token_cache_lock:
+        entry = _token_cache.get(token_key)
+        if entry is None:
+            return None
+        valid_until, snapshot = entry
+        if time.time() >= valid_until:
+            _token_cache.pop(token_key, None)
+            return None
+        _token_cache.move_to_end(token_key)
+    # Rebuild the user from the snapshot and attach it to this session without a SELECT
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+def _cache_user(token_key: str, user: User, token_exp):
+    valid_until = time.time() + TOKEN_CACHE_TTL_SECONDS
+    if token_exp is not None:
+        valid_until = min(valid_until, token_exp)
+    snapshot = {key: getattr(user, key) for key in _user_columns}
+    with _token_cache_lock:
+        _token_cache[token_key] = (valid_until, snapshot)
+        _token_cache.move_to_end(token_key)
+        while len(_token_cache) > TOKEN_CACHE_MAX_SIZE:
+            _token_cache.popitem(last=False)
+
+def invalidate_user_cache(user_id: int):
+    """Drop cached tokens for a user after their account data changes (call after commit)"""
+    with _token_cache_lock:
+        for token_key in [k for k, (_, snapshot) in _token_cache.items() if snapshot["id"] == user_id]:
+            _token_cache.pop(token_key, None)
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    token_key = _token_cache_key(token)
+    cached_user = _get_cached_user(token_key, db)
+    if cached_user is not None:
+        return cached_user
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -56,14 +128,15 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     user = db.query(User).filter(User.username == username).first()
     if user is None:
         raise credentials_exception
+    _cache_user(token_key, user, payload.get("exp"))
     return user
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)):
+def get_current_active_user(current_user: User = Depends(get_current_user)):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
-async def get_current_complete_user(current_user: User = Depends(get_current_active_user)):
+def get_current_complete_user(current_user: User = Depends(get_current_active_user)):
     """
     Check if user has completed their profile and changed their password.
     Use this dependency for protected routes that require full setup.
@@ -1,60 +1,113 @@
 #!/usr/bin/env python3
 """
 Script to check the current attachment data structure in the database.
+
+Attachment arrays are expanded by SQLite (json_each) and streamed one
+attachment per row, so no ticket's full array is decoded in Python.
 """
 
+import io
 import os
 import sys
-import json
 
-# Add the current directory to Python path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from sqlalchemy import text
+
+from database import get_db
+from paths import UPLOADS_DIR
+
+def scan_uploads(uploads_dir: str = str(UPLOADS_DIR)) -> dict:
+    """Walk the uploads tree once and map each relative file path to its stat result"""
+    file_stats = {}
+    pending = [(uploads_dir, "")]
+    while pending:
+        directory, prefix = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    rel_path = f"{prefix}{entry.name}"
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, f"{rel_path}/"))
+                    elif entry.is_file(follow_symlinks=False):
+                        file_stats[rel_path] = entry.stat(follow_symlinks=False)
+        except FileNotFoundError:
+            continue
+    return file_stats
+
+REQUIRED_FIELDS = ["filename", "path", "size", "uploaded_by", "uploaded_at"]
 
-from database import get_db, Ticket
+# Expand every ticket's attachments with json_each so the JSON inspection runs inside SQLite
+_missing_fields_sql = " || ".join(
+    f"CASE WHEN json_type(je.value, '$.{field}') IS NULL THEN '{field},' ELSE '' END"
+    for field in REQUIRED_FIELDS
+)
+ATTACHMENTS_QUERY = text(f"""
+    SELECT t.id,
+           json_array_length(t.attached) AS total,
+           je.key AS position,
+           je.type,
+           je.value,
+           CASE WHEN je.type = 'object' THEN
+               (SELECT group_concat(k.key, ', ') FROM json_each(je.value) AS k)
+           END AS keys,
+           CASE WHEN je.type = 'object' THEN rtrim({_missing_fields_sql}, ',') END AS missing_fields,
+           CASE WHEN je.type = 'object' THEN json_type(je.value, '$.path') IS NOT NULL END AS has_path,
+           CASE WHEN je.type = 'object' THEN json_extract(je.value, '$.path') END AS path
+    FROM tickets AS t
+    LEFT JOIN json_each(CASE WHEN json_type(t.attached) = 'array' THEN t.attached END) AS je
+    WHERE t.attached IS NOT NULL
+    ORDER BY t.id, je.key
+""").execution_options(stream_results=True, yield_per=500)
 
 def check_attachments():
     """Check the current attachment data structure"""
     print("Checking attachment data structure...")
     
+    file_stats = scan_uploads()
+    
     db = next(get_db())
     
+    # Collect the report in memory and write it out in one go instead of per line
+    report = io.StringIO()
+    write = report.write
+    
     try:
-        # Get all tickets with attachments
-        tickets = db.query(Ticket).filter(Ticket.attached.isnot(None)).all()
-        
-        for ticket in tickets:
-            print(f"\nTicket {ticket.id}:")
-            print(f"  Attachments: {len(ticket.attached) if ticket.attached else 0}")
+        current_ticket_id = None
+        for row in db.execute(ATTACHMENTS_QUERY):
+            if row.id != current_ticket_id:
+                current_ticket_id = row.id
+                write(f"\nTicket {row.id}:\n")
+                write(f"  Attachments: {row.total or 0}\n")
             
-            if ticket.attached:
-                for i, attachment in enumerate(ticket.attached):
-                    print(f"    Attachment {i+1}:")
-                    print(f"      Type: {type(attachment)}")
-                    print(f"      Content: {attachment}")
-                    
-                    if isinstance(attachment, dict):
-                        print(f"      Keys: {list(attachment.keys())}")
-                        
-                        # Check for required fields
-                        required_fields = ["filename", "path", "size", "uploaded_by", "uploaded_at"]
-                        missing_fields = [field for field in required_fields if field not in attachment]
-                        if missing_fields:
-                            print(f"      Missing fields: {missing_fields}")
-                        
-                        # Show file path info
-                        if "path" in attachment:
-                            print(f"      File path: {attachment['path']}")
-                            full_path = os.path.join("uploads", attachment["path"])
-                            if os.path.exists(full_path):
-                                print(f"      File exists: YES")
-                                stat_info = os.stat(full_path)
-                                print(f"      File size: {stat_info.st_size} bytes")
-                            else:
-                                print(f"      File exists: NO")
-                    
-                    print()
+            if row.position is None:
+                continue
+            
+            write(f"    Attachment {row.position + 1}:\n")
+            write(f"      Type: {row.type}\n")
+            write(f"      Content: {row.value}\n")
+            
+            if row.type == "object":
+                write(f"      Keys: [{row.keys or ''}]\n")
+                
+                # Check for required fields
+                if row.missing_fields:
+                    write(f"      Missing fields: [{row.missing_fields.replace(',', ', ')}]\n")
+                
+                # Show file path info
+                if row.has_path:
+                    write(f"      File path: {row.path}\n")
+                    stat_info = file_stats.get(row.path)
+                    if stat_info is not None:
+                        write(f"      File exists: YES\n")
+                        write(f"      File size: {stat_info.st_size} bytes\n")
+                    else:
+                        write(f"      File exists: NO\n")
+            
+            write("\n")
+        
+        sys.stdout.write(report.getvalue())
                     
     except Exception as e:
+        sys.stdout.write(report.getvalue())
         print(f"Error checking attachments: {e}")
         raise
     finally:
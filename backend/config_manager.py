@@ -4,17 +4,31 @@ Configuration Manager for Ticket Manager
 Loads reference data from JSON configuration files
 """
 
+import importlib.util
 import json
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
 from pathlib import Path
 
+import orjson
+
+from paths import CONFIG_DIR
+
+COMPILED_MODULE_NAME = "_compiled"
+
+logger = logging.getLogger(__name__)
+
 class ConfigManager:
     """Manages configuration data loaded from JSON files"""
     
-    def __init__(self, config_dir: str = "config"):
+    def __init__(self, config_dir: str = str(CONFIG_DIR), preload: bool = False):
         self.config_dir = Path(config_dir)
         self._cache = {}
+        self._compiled = None
+        if preload:
+            self.preload_all()
     
     def load_config(self, config_name: str) -> List[Dict[str, Any]]:
         """
@@ -30,21 +44,74 @@ class ConfigManager:
             FileNotFoundError: If the configuration file doesn't exist
             json.JSONDecodeError: If the JSON file is malformed
         """
-        if config_name in self._cache:
-            return self._cache[config_name]
-        
         config_file = self.config_dir / f"{config_name}.json"
         
-        if not config_file.exists():
+        try:
+            mtime_ns = config_file.stat().st_mtime_ns
+        except FileNotFoundError:
             raise FileNotFoundError(f"Configuration file not found: {config_file}")
         
-        try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self._cache[config_name] = data
-                return data
-        except json.JSONDecodeError as e:
-            raise json.JSONDecodeError(f"Invalid JSON in {config_file}: {e}", e.doc, e.pos)
+        # Serve from cache while the file on disk is unchanged
+        cached = self._cache.get(config_name)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        
+        # Prefer the precompiled module when it was built from this version of the file
+        compiled = self._load_compiled()
+        if compiled.MTIMES.get(config_name) == mtime_ns:
+            data = compiled.CONFIGS[config_name]
+        else:
+            try:
+                data = orjson.loads(config_file.read_bytes())
+            except json.JSONDecodeError as e:
+                # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+                raise json.JSONDecodeError(f"Invalid JSON in {config_file}: {e}", e.doc, e.pos)
+        
+        self._cache[config_name] = (mtime_ns, data)
+        return data
+    
+    def _load_compiled(self):
+        """Import the precompiled configuration module once, or an empty stand-in if absent"""
+        if self._compiled is None:
+            self._compiled = _EmptyCompiledConfig
+            compiled_file = self.config_dir / f"{COMPILED_MODULE_NAME}.py"
+            if compiled_file.exists():
+                # Loading through the source loader reuses the cached .pyc bytecode
+                spec = importlib.util.spec_from_file_location(f"config{COMPILED_MODULE_NAME}", compiled_file)
+                module = importlib.util.module_from_spec(spec)
+                try:
+                    spec.loader.exec_module(module)
+                    self._compiled = module
+                except Exception:
+                    logger.warning("Could not load %s; falling back to the JSON files", compiled_file, exc_info=True)
+        return self._compiled
+    
+    def compile_configs(self) -> Path:
+        """
+        Write all configuration files into a Python module of literals
+        
+        The module records each file's mtime, so entries are only used
+        while the JSON file they were built from is unchanged.
+        
+        Returns:
+            Path of the generated module
+        """
+        configs = {}
+        mtimes = {}
+        for config_name in sorted(self.list_config_files()):
+            config_file = self.config_dir / f"{config_name}.json"
+            mtimes[config_name] = config_file.stat().st_mtime_ns
+            configs[config_name] = orjson.loads(config_file.read_bytes())
+        
+        compiled_file = self.config_dir / f"{COMPILED_MODULE_NAME}.py"
+        compiled_file.write_text(
+            "# Generated by ConfigManager.compile_configs() - do not edit\n"
+            f"MTIMES = {mtimes!r}\n"
+            f"CONFIGS = {configs!r}\n",
+            encoding="utf-8"
+        )
+        self._compiled = None
+        return compiled_file
     
     def get_statuses(self) -> List[Dict[str, Any]]:
         """Get statuses configuration"""
@@ -91,6 +158,16 @@ class ConfigManager:
         except (FileNotFoundError, json.JSONDecodeError):
             return False
     
+    def preload_all(self):
+        """
+        Load all configuration files concurrently to overlap disk reads
+        
+        Files that are missing or malformed are skipped here; the error is
+        raised again when that configuration is requested.
+        """
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(self.validate_config, self.list_config_files()))
+    
     def list_config_files(self) -> List[str]:
         """List all available configuration files"""
         config_files = []
@@ -98,5 +175,10 @@ class ConfigManager:
             config_files.append(file_path.stem)
         return config_files
 
+class _EmptyCompiledConfig:
+    """Stand-in used when no precompiled configuration module exists"""
+    MTIMES = {}
+    CONFIGS = {}
+
 # Global instance for easy access
 config_manager = ConfigManager() 
\ No newline at end of file
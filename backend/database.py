@@ -1,18 +1,110 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, ForeignKey, Boolean, JSON, Date
+import logging
+import os
+import traceback
+
+from sqlalchemy import create_engine, event, Column, Integer, String, DateTime, Text, ForeignKey, Boolean, JSON, Date, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
-from datetime import datetime
-import os
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql import func
+import orjson
+
+from paths import DB_PATH
+
+logger = logging.getLogger(__name__)
 
 # Database URL - use absolute path to work from any directory
-current_dir = os.path.dirname(os.path.abspath(__file__))
-DATABASE_URL = f"sqlite:///{os.path.join(current_dir, 'ticket_manager.db')}"
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DB_PATH}")
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+def _json_serializer(value):
+    # orjson returns bytes; JSON columns must stay TEXT for SQLite's json functions
+    return orjson.dumps(value).decode()
+
+if IS_SQLITE:
+    # A local SQLite file never drops idle connections, so pooled connections are
+    # kept indefinitely and reused without a liveness ping on checkout. WAL lets the
+    # threadpool's readers run alongside a writer, so keep a fixed set of connections
+    # (pragmas applied once, page cache kept warm) instead of opening overflow ones
+    pool_options = {
+        "connect_args": {"check_same_thread": False},
+        "pool_size": 20,
+        "max_overflow": 0,
+        "pool_pre_ping": False,
+        "pool_recycle": -1,
+    }
+else:
+    # Server databases close idle connections, so ping on checkout and recycle
+    # well before the server-side or proxy idle timeout kicks in. The pool covers
+    # FastAPI's threadpool; requests beyond it wait up to pool_timeout for a connection
+    pool_options = {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 30,
+        "pool_pre_ping": True,
+        "pool_recycle": 300,
+    }
+    if DATABASE_URL.startswith("postgresql"):
+        # Name the connections in pg_stat_activity and skip JIT, which only adds
+        # planning time to these short OLTP queries
+        pool_options["connect_args"] = {"application_name": "pisiris", "options": "-c jit=off"}
+
+engine = create_engine(
+    DATABASE_URL,
+    poolclass=QueuePool,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    **pool_options,
+)
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL journaling and relaxed fsync so each commit doesn't pay a full sync"""
+    if not IS_SQLITE:
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.executescript(
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        "PRAGMA cache_size=-65536;"
+        "PRAGMA temp_store=MEMORY;"
+        "PRAGMA mmap_size=268435456;"
+    )
+    cursor.close()
+
+# Keep loaded attributes after commit so handlers can return the objects they just
+# wrote without reloading them
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Development guard against N+1 regressions: "warn" logs every relationship lazy load
+# with the code line that triggered it, "raise" turns it into an error (for CI runs)
+LAZY_LOAD_CHECK = os.getenv("LAZY_LOAD_CHECK", "").lower()
+
+class LazyLoadError(RuntimeError):
+    """A relationship was lazy-loaded while LAZY_LOAD_CHECK=raise"""
+
+if LAZY_LOAD_CHECK in ("warn", "raise"):
+    @event.listens_for(SessionLocal, "do_orm_execute")
+    def report_lazy_load(orm_execute_state):
+        if not orm_execute_state.is_select or orm_execute_state.lazy_loaded_from is None:
+            return
+        relationship_name = orm_execute_state.loader_strategy_path[-1]
+        caller = next(
+            (frame for frame in reversed(traceback.extract_stack())
+             if "sqlalchemy" not in frame.filename and frame.filename != __file__),
+            None
+        )
+        where = f"{caller.filename}:{caller.lineno}" if caller else "unknown"
+        message = f"Lazy load of {relationship_name} at {where}"
+        if LAZY_LOAD_CHECK == "raise":
+            raise LazyLoadError(message)
+        logger.warning(message)
 
 Base = declarative_base()
 
+# Timestamps use func.now() (CURRENT_TIMESTAMP, UTC) so SQLite fills them in the INSERT itself;
+# default= covers databases created before the server_default existed.
+
 class User(Base):
     __tablename__ = "users"
     
@@ -49,8 +141,8 @@ class Ticket(Base):
     url = Column(String, nullable=True)  # New field
     status_id = Column(Integer, ForeignKey("status.id"), nullable=False)
     crit_id = Column(Integer, ForeignKey("crit.id"), nullable=False)
-    creation_date = Column(Date, default=datetime.utcnow().date, nullable=False)
-    modify_date = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
+    creation_date = Column(Date, server_default=func.current_date(), nullable=False)
+    modify_date = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), nullable=True)
     resolution_date = Column(Date, nullable=True)  # Auto-set when status=solved
     delete_date = Column(Date, nullable=True)  # Auto-set when status=deleted
     modify_reason = Column(Text, nullable=True)  # Linked to status change
@@ -66,12 +158,33 @@ class Ticket(Base):
     # Relationships
     created_by_user = relationship("User", back_populates="tickets_created", foreign_keys=[creator])
     notifier_user = relationship("User", back_populates="tickets_notified", foreign_keys=[notifier])
+    # Small lookup tables. Not loaded by default: the list/detail endpoints read them from
+    # the in-memory reference tables, other paths opt in with selectinload(...)
     status = relationship("Status")
     crit = relationship("Crit")
     center = relationship("Center")
     tool = relationship("Tool")
+    # Potentially large collections stay lazy; use .options(selectinload(...)) where needed
     modifications = relationship("Modification", back_populates="ticket")
     comments = relationship("Comment", back_populates="ticket")
+    
+    __table_args__ = (
+        # Partial index so "tickets with attachments" scans stay index-only
+        Index("ix_tickets_attached_notnull", "id", sqlite_where=attached.isnot(None)),
+        # Composite indexes for the common filter combinations
+        Index("ix_ticket_status_date", "status_id", "creation_date"),
+        Index("ix_ticket_creator_status", "creator", "status_id"),
+        Index("ix_ticket_tool_crit", "tool_id", "crit_id"),
+        # Filter + creation_date sort/range paths of the ticket list
+        Index("ix_ticket_type_date", "type", "creation_date"),
+        Index("ix_ticket_tool_date", "tool_id", "creation_date"),
+        Index("ix_ticket_ticket_num", "ticket_num"),
+        # Live (not soft-deleted) tickets, for the dashboard's counts and 30-day trend
+        Index("ix_ticket_active_status", "status_id",
+              sqlite_where=delete_date.is_(None), postgresql_where=delete_date.is_(None)),
+        Index("ix_ticket_active_creation", "creation_date",
+              sqlite_where=delete_date.is_(None), postgresql_where=delete_date.is_(None)),
+    )
 
 class Status(Base):
     __tablename__ = "status"
@@ -107,7 +220,7 @@ class Modification(Base):
     id = Column(Integer, primary_key=True, index=True)
     ticket_id = Column(String, ForeignKey("tickets.id"))  # String for hex-based IDs
     user_id = Column(Integer, ForeignKey("users.id"))
-    date = Column(DateTime, default=datetime.utcnow)
+    date = Column(DateTime, default=func.now(), server_default=func.now())
     reason = Column(Text)
     
     # New fields for tracking changes
@@ -118,6 +231,11 @@ class Modification(Base):
     # Relationships
     ticket = relationship("Ticket", back_populates="modifications")
     user = relationship("User", back_populates="modifications")
+    
+    __table_args__ = (
+        # Per-ticket history in date order (get_ticket_modifications)
+        Index("ix_modification_ticket_date", "ticket_id", "date"),
+    )
 
 class Comment(Base):
     __tablename__ = "comments"
@@ -126,15 +244,24 @@ class Comment(Base):
     ticket_id = Column(String, ForeignKey("tickets.id"), nullable=False)  # String for hex-based IDs
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     content = Column(Text, nullable=False)  # Comment text
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)  # When comment was posted
+    created_at = Column(DateTime, default=func.now(), server_default=func.now(), nullable=False)  # When comment was posted
     
     # Relationships
     ticket = relationship("Ticket", back_populates="comments")
     user = relationship("User", back_populates="comments")
+    
+    __table_args__ = (
+        # A ticket's comments newest first (get_ticket_comments)
+        Index("ix_comment_ticket_created", "ticket_id", "created_at"),
+    )
 
 # Create tables
 def create_tables():
     Base.metadata.create_all(bind=engine)
+    # create_all skips the indexes of tables that already exist, so add any new ones
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 # Database dependency
 def get_db():
@@ -3,15 +3,11 @@
 Debug script to test file upload logic and identify issues.
 """
 
-import os
-import sys
 import json
 from datetime import datetime
 
-# Add the current directory to Python path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 from database import get_db, Ticket
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 def debug_upload():
@@ -51,26 +47,22 @@ def debug_upload():
         
         print(f"\nAdding new attachment: {new_attachment}")
         
-        # Get current attachments
-        current_attachments = ticket.attached or []
-        print(f"Current attachments array: {current_attachments}")
-        print(f"Type: {type(current_attachments)}")
-        
-        # Add new attachment
-        current_attachments.append(new_attachment)
-        print(f"After adding: {len(current_attachments)} attachments")
-        
-        # Update ticket
-        ticket.attached = current_attachments
-        print("Updated ticket.attached")
+        # Append server-side so only the new element is serialized
+        result = db.execute(
+            text(
+                "UPDATE tickets SET attached = json_insert(COALESCE(attached, '[]'), '$[#]', json(:attachment)) "
+                "WHERE id = :ticket_id"
+            ),
+            {"attachment": json.dumps(new_attachment), "ticket_id": ticket.id}
+        )
+        print(f"Updated ticket.attached ({result.rowcount} row)")
         
         # Commit to database
         db.commit()
         print("Committed to database")
         
-        # Refresh and check
-        db.refresh(ticket)
-        print(f"After refresh: {len(ticket.attached)} attachments")
+        # The commit expired the ticket, so this re-reads the stored value
+        print(f"After commit: {len(ticket.attached)} attachments")
         
         if ticket.attached:
             for i, att in enumerate(ticket.attached):
@@ -9,7 +9,7 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from database import create_tables, SessionLocal, User, Status, Crit, Center, Tool
-from auth import get_password_hash
+from auth import get_seed_password_hash
 from config_manager import config_manager
 
 def init_database():
@@ -21,68 +21,52 @@ def init_database():
     try:
         # Initialize reference data from configuration files
         print("Loading reference data from configuration files...")
+        config_manager.preload_all()
         
         # Load and initialize statuses
         try:
             statuses = config_manager.get_statuses()
-            for status_data in statuses:
-                existing = db.query(Status).filter(Status.value == status_data["value"]).first()
-                if not existing:
-                    db_status = Status(**status_data)
-                    db.add(db_status)
-                    print(f"Added status: {status_data['desc']}")
+            existing_values = {value for (value,) in db.query(Status.value)}
+            new_statuses = [status_data for status_data in statuses if status_data["value"] not in existing_values]
+            db.bulk_insert_mappings(Status, new_statuses)
+            for status_data in new_statuses:
+                print(f"Added status: {status_data['desc']}")
         except Exception as e:
             print(f"Warning: Could not load statuses from config: {e}")
         
         # Load and initialize crits (Priority levels)
         try:
             crits = config_manager.get_crits()
-            for crit_data in crits:
-                existing = db.query(Crit).filter(Crit.value == crit_data["value"]).first()
-                if not existing:
-                    db_crit = Crit(**crit_data)
-                    db.add(db_crit)
-                    print(f"Added crit: {crit_data['desc']}")
+            existing_values = {value for (value,) in db.query(Crit.value)}
+            new_crits = [crit_data for crit_data in crits if crit_data["value"] not in existing_values]
+            db.bulk_insert_mappings(Crit, new_crits)
+            for crit_data in new_crits:
+                print(f"Added crit: {crit_data['desc']}")
         except Exception as e:
             print(f"Warning: Could not load crits from config: {e}")
         
         # Load and initialize centers
         try:
             centers = config_manager.get_centers()
-            for center_data in centers:
-                existing = db.query(Center).filter(Center.value == center_data["value"]).first()
-                if not existing:
-                    db_center = Center(**center_data)
-                    db.add(db_center)
-                    print(f"Added center: {center_data['desc']}")
+            existing_values = {value for (value,) in db.query(Center.value)}
+            new_centers = [center_data for center_data in centers if center_data["value"] not in existing_values]
+            db.bulk_insert_mappings(Center, new_centers)
+            for center_data in new_centers:
+                print(f"Added center: {center_data['desc']}")
         except Exception as e:
             print(f"Warning: Could not load centers from config: {e}")
         
         # Load and initialize tools
         try:
             tools = config_manager.get_tools()
-            for tool_data in tools:
-                existing = db.query(Tool).filter(Tool.value == tool_data["value"]).first()
-                if not existing:
-                    db_tool = Tool(**tool_data)
-                    db.add(db_tool)
-                    print(f"Added tool: {tool_data['desc']}")
+            existing_values = {value for (value,) in db.query(Tool.value)}
+            new_tools = [tool_data for tool_data in tools if tool_data["value"] not in existing_values]
+            db.bulk_insert_mappings(Tool, new_tools)
+            for tool_data in new_tools:
+                print(f"Added tool: {tool_data['desc']}")
         except Exception as e:
             print(f"Warning: Could not load tools from config: {e}")
         
-        # Create admin user
-        admin_user = db.query(User).filter(User.username == "admin").first()
-        if not admin_user:
-            admin_user = User(
-                username="admin",
-                email="admin@example.com",
-                hashed_password=get_password_hash("admin123"),
-                permission_level=1,
-                is_active=True
-            )
-            db.add(admin_user)
-            print("Created admin user: admin/admin123")
-        
         # Create sample users
         sample_users = [
             {
@@ -99,19 +83,38 @@ def init_database():
             }
         ]
         
+        # Look up all seeded usernames (admin included) in one query
+        seed_usernames = ["admin"] + [u["username"] for u in sample_users]
+        existing_usernames = {
+            username for (username,) in db.query(User.username).filter(User.username.in_(seed_usernames))
+        }
+        
+        new_users = []
+        
+        # Create admin user
+        if "admin" not in existing_usernames:
+            new_users.append({
+                "username": "admin",
+                "email": "admin@example.com",
+                "hashed_password": get_seed_password_hash("admin123"),
+                "permission_level": 1,
+                "is_active": True
+            })
+            print("Created admin user: admin/admin123")
+        
         for user_data in sample_users:
-            existing = db.query(User).filter(User.username == user_data["username"]).first()
-            if not existing:
-                user = User(
-                    username=user_data["username"],
-                    email=user_data["email"],
-                    hashed_password=get_password_hash(user_data["password"]),
-                    permission_level=user_data["permission_level"],
-                    is_active=True
-                )
-                db.add(user)
+            if user_data["username"] not in existing_usernames:
+                new_users.append({
+                    "username": user_data["username"],
+                    "email": user_data["email"],
+                    "hashed_password": get_seed_password_hash(user_data["password"]),
+                    "permission_level": user_data["permission_level"],
+                    "is_active": True
+                })
                 print(f"Created user: {user_data['username']}/{user_data['password']}")
         
+        db.bulk_insert_mappings(User, new_users)
+        
         db.commit()
         print("\nDatabase initialization completed successfully!")
         print("\nSample users created:")
@@ -1,15 +1,20 @@
 import os
 import sqlite3
-from database import engine, Base, SessionLocal
+from paths import DB_PATH, CONFIG_DIR
+from database import engine, Base, SessionLocal, Status, Crit, Center, Tool
 from sqlalchemy import text
 import json
 
 def clean_database():
     """Remove the existing database file and recreate it"""
-    db_path = os.path.join(os.path.dirname(__file__), 'ticket_manager.db')
+    db_path = str(DB_PATH)
     if os.path.exists(db_path):
         os.remove(db_path)
         print("Existing database removed.")
+    # Remove leftover WAL files so they are not replayed into the new database
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
 
 def create_tables():
     """Create all tables with the new schema"""
@@ -24,8 +29,7 @@ def insert_initial_data():
         from config_manager import config_manager
         try:
             statuses = config_manager.get_statuses()
-            for status in statuses:
-                db.execute(text("INSERT INTO status (value, desc) VALUES (:value, :desc)"), status)
+            db.execute(Status.__table__.insert(), statuses)
         except Exception as e:
             print(f"Warning: Could not load statuses from config, using fallback: {e}")
             # Fallback to hardcoded list if config fails
@@ -41,8 +45,7 @@ def insert_initial_data():
                 {"value": "on_hold", "desc": "Aturada"},
                 {"value": "reopened", "desc": "Reoberta"}
             ]
-            for status in statuses:
-                db.execute(text("INSERT INTO status (value, desc) VALUES (:value, :desc)"), status)
+            db.execute(Status.__table__.insert(), statuses)
         
         # Insert crits
         crits = [
@@ -51,32 +54,24 @@ def insert_initial_data():
             {"value": "high", "desc": "Alta"},
             {"value": "critical", "desc": "Crítica"}
         ]
-        
-        for crit in crits:
-            db.execute(text("INSERT INTO crit (value, desc) VALUES (:value, :desc)"), crit)
+        db.execute(Crit.__table__.insert(), crits)
         
         # Insert centers (using the existing centers.json)
-        centers_path = os.path.join(os.path.dirname(__file__), 'config', 'centers.json')
-        with open(centers_path, 'r', encoding='utf-8') as f:
+        with open(CONFIG_DIR / 'centers.json', 'r', encoding='utf-8') as f:
             centers_data = json.load(f)
-        
-        for center in centers_data:
-            db.execute(text("INSERT INTO center (value, desc) VALUES (:value, :desc)"), center)
+        db.execute(Center.__table__.insert(), centers_data)
         
         # Insert tools (using the existing tools.json)
-        tools_path = os.path.join(os.path.dirname(__file__), 'config', 'tools.json')
-        with open(tools_path, 'r', encoding='utf-8') as f:
+        with open(CONFIG_DIR / 'tools.json', 'r', encoding='utf-8') as f:
             tools_data = json.load(f)
-        
-        for tool in tools_data:
-            db.execute(text("INSERT INTO tool (value, desc) VALUES (:value, :desc)"), tool)
+        db.execute(Tool.__table__.insert(), tools_data)
         
         # Insert a default admin user
-        from auth import get_password_hash
+        from auth import get_seed_password_hash
         admin_user = {
             "username": "admin",
             "email": "admin@example.com",
-            "hashed_password": get_password_hash("admin123"),
+            "hashed_password": get_seed_password_hash("admin123"),
             "name": "Administrador",
             "surnames": "Sistema",
             "permission_level": 1,
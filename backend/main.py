@@ -1,16 +1,30 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import FastAPI, Depends, HTTPException, status, Query, UploadFile, File, BackgroundTasks, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi.responses import FileResponse, ORJSONResponse, Response
+from sqlalchemy.orm import Session, selectinload, joinedload, noload, aliased
 from sqlalchemy.orm.attributes import flag_modified
-from sqlalchemy import or_, and_, func, String, case, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy import or_, and_, func, String, case, select, delete, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from pydantic import BaseModel
 from typing import List, Optional
-from datetime import timedelta, datetime
+from datetime import date, timedelta, datetime
+from email.utils import formatdate
+from functools import lru_cache
+from operator import attrgetter
 import uuid
+import mimetypes
+import urllib.parse
+import logging
 import os
+import hashlib
 import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from database import get_db, create_tables, User, Ticket, Modification, Comment, Status, Crit, Center, Tool
 from models import (
@@ -19,16 +33,19 @@ from models import (
     Token, Status as StatusModel, Crit as CritModel, Center as CenterModel, Tool as ToolModel,
     TicketListResponse, ModificationListResponse, GroupedModificationListResponse, UserUpdate,
     CommentCreate, Comment as CommentModel, CommentWithUser, CommentListResponse,
-    ProfileCompleteRequest, FirstPasswordChange
+    ProfileCompleteRequest, FirstPasswordChange, UserListItem
 )
 from auth import (
     authenticate_user, create_access_token, get_current_active_user, 
-    get_current_complete_user, get_password_hash, check_permission, ACCESS_TOKEN_EXPIRE_MINUTES
+    get_current_complete_user, get_password_hash, check_permission, invalidate_user_cache,
+    ACCESS_TOKEN_EXPIRE_MINUTES
 )
 from ticket_id_generator import generate_ticket_id
 
+logger = logging.getLogger(__name__)
+
 # Status transition rules - defines valid transitions between statuses
-STATUS_TRANSITIONS = {
+STATUS_TRANSITIONS = {status: frozenset(next_statuses) for status, next_statuses in {
     'created': ['reviewed', 'notified', 'deleted'],
     'reviewed': ['notified', 'closed', 'solved', 'deleted'],
     'deleted': ['reopened'],
@@ -38,14 +55,15 @@ STATUS_TRANSITIONS = {
     'closed': ['reopened', 'deleted'],
     'solved': ['reopened', 'deleted'],
     'reopened': ['notified', 'closed', 'solved', 'deleted']
-}
+}.items()}
+_NO_TRANSITIONS = frozenset()
 
 def is_valid_status_transition(from_status_value: str, to_status_value: str) -> bool:
     """
     Check if a status transition is valid
     
     Args:
-        from_status_value: Current status value (e.g., 'created', 'reviewed')
+        from_status_value: Current status value, lowercase as stored (e.g., 'created', 'reviewed')
         to_status_value: Target status value
         
     Returns:
@@ -54,18 +72,18 @@ def is_valid_status_transition(from_status_value: str, to_status_value: str) ->
     if not from_status_value or not to_status_value:
         return False
     
-    from_status = from_status_value.lower()
-    to_status = to_status_value.lower()
-    
     # Same status is always valid (no change)
-    if from_status == to_status:
+    if from_status_value == to_status_value:
         return True
     
-    # Check if transition is in allowed list
-    valid_next_statuses = STATUS_TRANSITIONS.get(from_status, [])
-    return to_status in valid_next_statuses
+    # Check if transition is in allowed set
+    return to_status_value in STATUS_TRANSITIONS.get(from_status_value, _NO_TRANSITIONS)
 
-app = FastAPI(title="Ticket Manager API", version="1.0.0")
+# Endpoints are plain `def` on purpose: the Session is synchronous, so FastAPI
+# runs them in its threadpool instead of blocking the event loop on SQL/disk I/O
+# orjson renders the dict/list payloads (reference lists, comments, dashboard)
+# faster than the stdlib encoder and produces bytes directly
+app = FastAPI(title="Ticket Manager API", version="1.0.0", default_response_class=ORJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -79,17 +97,45 @@ app.add_middleware(
 # Create uploads directory if it doesn't exist
 UPLOADS_DIR = "uploads"
 TICKETS_UPLOADS_DIR = os.path.join(UPLOADS_DIR, "tickets")
-if not os.path.exists(UPLOADS_DIR):
-    os.makedirs(UPLOADS_DIR)
-if not os.path.exists(TICKETS_UPLOADS_DIR):
-    os.makedirs(TICKETS_UPLOADS_DIR)
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Read uploads in 1 MiB chunks
+# Upload validation limits
+MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB limit
+ALLOWED_EXTENSIONS = frozenset({
+    '.pdf', '.doc', '.docx', '.txt', '.rtf',
+    '.jpg', '.jpeg', '.png', '.gif', '.bmp',
+    '.xls', '.xlsx', '.csv', '.ppt', '.pptx',
+    '.zip', '.rar', '.7z', '.tar', '.gz'
+})
+UPLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=4)  # Writes the files of one request in parallel
+os.makedirs(TICKETS_UPLOADS_DIR, exist_ok=True)
+
+# Behind nginx, set UPLOADS_ACCEL_REDIRECT to an `internal` location aliased to the
+# uploads directory (e.g. "/internal/uploads/"): responses then carry only headers and
+# nginx sends the file itself with sendfile(2) instead of Python copying every chunk
+UPLOADS_ACCEL_REDIRECT = os.getenv("UPLOADS_ACCEL_REDIRECT")
+
+def accel_redirect_response(full_path: str, headers: dict, media_type: str) -> Response:
+    """Header-only response that has nginx serve the upload at full_path"""
+    relative_path = os.path.relpath(full_path, UPLOADS_DIR).replace(os.sep, "/")
+    location = UPLOADS_ACCEL_REDIRECT.rstrip("/") + "/" + urllib.parse.quote(relative_path)
+    return Response(media_type=media_type, headers={**headers, "X-Accel-Redirect": location})
+
+class UploadsStaticFiles(StaticFiles):
+    """StaticFiles that hands the transfer to nginx when UPLOADS_ACCEL_REDIRECT is set"""
+    def file_response(self, full_path, stat_result, scope, status_code=200) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if not UPLOADS_ACCEL_REDIRECT or not isinstance(response, FileResponse):
+            return response
+        headers = {key: value for key, value in response.headers.items()
+                   if key in ("etag", "last-modified")}
+        return accel_redirect_response(full_path, headers, response.media_type)
 
 # Mount static files for serving uploaded files
-app.mount("/uploads", StaticFiles(directory=UPLOADS_DIR), name="uploads")
+app.mount("/uploads", UploadsStaticFiles(directory=UPLOADS_DIR), name="uploads")
 
 # Create tables on startup
 @app.on_event("startup")
-async def startup_event():
+def startup_event():
     create_tables()
     # Initialize missing reference data (statuses, crits, centers, tools)
     # This ensures new statuses are automatically added on deployment
@@ -107,6 +153,7 @@ async def startup_event():
                     db.add(db_status)
                     print(f"✅ Auto-added missing status: {status_data['desc']} ({status_data['value']})")
             db.commit()
+            invalidate_reference_caches()
         except Exception as e:
             print(f"⚠️ Warning: Could not auto-initialize statuses on startup: {e}")
             db.rollback()
@@ -118,7 +165,7 @@ async def startup_event():
 
 # Authentication endpoints
 @app.post("/token", response_model=Token)
-async def login_for_access_token(
+def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
@@ -143,27 +190,32 @@ async def login_for_access_token(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.get("/users/me", response_model=UserModel)
-async def read_users_me(current_user: User = Depends(get_current_active_user)):
+def read_users_me(current_user: User = Depends(get_current_active_user)):
     return current_user
 
 # User management endpoints
+def user_conflict_detail(error: IntegrityError) -> str:
+    """Map a users UNIQUE violation to the message the API has always returned"""
+    if "username" in str(error.orig):
+        return "Username already registered"
+    return "Email already registered"
+
+def commit_user_changes(db: Session):
+    """Commit, letting the UNIQUE indexes on username/email reject duplicates"""
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=user_conflict_detail(e))
+
 @app.post("/users/", response_model=UserModel)
-async def create_user(
+def create_user(
     user: UserCreate,
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
 ):
     check_permission(current_user, 1)  # Only level 1 can create users
     
-    # Check if username or email already exists
-    db_user = db.query(User).filter(User.username == user.username).first()
-    if db_user:
-        raise HTTPException(status_code=400, detail="Username already registered")
-    
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if db_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
     # Auto-generate password from email (part before @)
     auto_password = user.email.split('@')[0]
     hashed_password = get_password_hash(auto_password)
@@ -187,12 +239,11 @@ async def create_user(
         must_change_password=True  # Must change password on first login
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    commit_user_changes(db)
     return db_user
 
 @app.get("/users/", response_model=List[UserModel])
-async def get_users(
+def get_users(
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
 ):
@@ -200,18 +251,21 @@ async def get_users(
     users = db.query(User).all()
     return users
 
-@app.get("/users/list", response_model=List[UserModel])
-async def get_users_list(
+@app.get("/users/list", response_model=List[UserListItem])
+def get_users_list(
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
 ):
     """Get list of users for dropdown selection (permission level 2+)"""
     check_permission(current_user, 2)
-    users = db.query(User).filter(User.is_active == True).all()
+    # Only the columns the dropdown shows
+    users = db.query(
+        User.id, User.username, User.name, User.surnames, User.permission_level
+    ).filter(User.is_active == True).all()
     return users
 
 @app.put("/users/me", response_model=UserModel)
-async def update_current_user(
+def update_current_user(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
@@ -221,19 +275,21 @@ async def update_current_user(
     
     # Handle password change separately
     if "password" in update_data:
-        hashed_password = get_password_hash(update_data.pop("password"))
-        current_user.hashed_password = hashed_password
+        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
     
-    # Update other fields
-    for field, value in update_data.items():
-        setattr(current_user, field, value)
-    
-    db.commit()
-    db.refresh(current_user)
+    # Write just the changed columns; the session syncs them onto current_user
+    if update_data:
+        try:
+            db.execute(update(User).where(User.id == current_user.id).values(**update_data))
+        except IntegrityError as e:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=user_conflict_detail(e))
+        db.commit()
+        invalidate_user_cache(current_user.id)
     return current_user
 
 @app.post("/users/me/complete-profile", response_model=UserModel)
-async def complete_profile(
+def complete_profile(
     profile_data: ProfileCompleteRequest,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -260,11 +316,11 @@ async def complete_profile(
     current_user.must_complete_profile = False
     
     db.commit()
-    db.refresh(current_user)
+    invalidate_user_cache(current_user.id)
     return current_user
 
 @app.post("/users/me/change-first-password", response_model=UserModel)
-async def change_first_password(
+def change_first_password(
     password_data: FirstPasswordChange,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -279,11 +335,11 @@ async def change_first_password(
     current_user.must_change_password = False
     
     db.commit()
-    db.refresh(current_user)
+    invalidate_user_cache(current_user.id)
     return current_user
 
 @app.put("/users/{user_id}", response_model=UserModel)
-async def update_user(
+def update_user(
     user_id: int,
     user_update: UserUpdate,
     current_user: User = Depends(get_current_complete_user),
@@ -291,28 +347,31 @@ async def update_user(
 ):
     check_permission(current_user, 1)  # Only level 1 can update other users
     
-    db_user = db.query(User).filter(User.id == user_id).first()
-    if not db_user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
     # Update only the fields that are provided
     update_data = user_update.model_dump(exclude_unset=True)
     
     # Handle password change separately
     if "password" in update_data:
-        hashed_password = get_password_hash(update_data.pop("password"))
-        db_user.hashed_password = hashed_password
+        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
     
-    # Update other fields
-    for field, value in update_data.items():
-        setattr(db_user, field, value)
+    # Write just the changed columns and read the updated row back in the same statement
+    if update_data:
+        try:
+            db_user = db.scalar(update(User).where(User.id == user_id).values(**update_data).returning(User))
+        except IntegrityError as e:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=user_conflict_detail(e))
+    else:
+        db_user = db.query(User).filter(User.id == user_id).first()
+    if not db_user:
+        raise HTTPException(status_code=404, detail="User not found")
     
     db.commit()
-    db.refresh(db_user)
+    invalidate_user_cache(user_id)
     return db_user
 
 @app.delete("/users/{user_id}")
-async def delete_user(
+def delete_user(
     user_id: int,
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
@@ -326,25 +385,44 @@ async def delete_user(
             detail="You cannot delete your own account"
         )
     
-    db_user = db.query(User).filter(User.id == user_id).first()
-    if not db_user:
-        raise HTTPException(status_code=404, detail="User not found")
+    # Delete in one statement, guarded so the last active admin is never removed and
+    # users still referenced as ticket creator or comment author are left alone
+    active_admin_count = select(func.count()).select_from(User).where(
+        User.permission_level == 1, User.is_active == True
+    ).scalar_subquery()
+    result = db.execute(
+        delete(User)
+        .where(User.id == user_id)
+        .where(or_(User.permission_level != 1, active_admin_count > 1))
+        .where(~select(Ticket.id).where(Ticket.creator == user_id).exists())
+        .where(~select(Comment.id).where(Comment.user_id == user_id).exists())
+    )
     
-    # Check if this is the last admin
-    if db_user.permission_level == 1:
-        admin_count = db.query(User).filter(User.permission_level == 1, User.is_active == True).count()
-        if admin_count <= 1:
+    if result.rowcount == 0:
+        db.rollback()
+        db_user = db.query(User).filter(User.id == user_id).first()
+        if not db_user:
+            raise HTTPException(status_code=404, detail="User not found")
+        if db.query(Ticket.id).filter(Ticket.creator == user_id).first() or \
+                db.query(Comment.id).filter(Comment.user_id == user_id).first():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot delete the last active admin user"
+                detail="Cannot delete a user who has created tickets or comments"
             )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot delete the last active admin user"
+        )
     
-    db.delete(db_user)
+    # Clear optional references the ORM used to null out on delete
+    db.execute(update(Ticket).where(Ticket.notifier == user_id).values(notifier=None))
+    db.execute(update(Modification).where(Modification.user_id == user_id).values(user_id=None))
     db.commit()
+    invalidate_user_cache(user_id)
     return {"message": "User deleted successfully"}
 
 @app.post("/users/{user_id}/reset-password")
-async def reset_user_password(
+def reset_user_password(
     user_id: int,
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
@@ -361,7 +439,7 @@ async def reset_user_password(
     
     db_user.hashed_password = hashed_password
     db.commit()
-    db.refresh(db_user)
+    invalidate_user_cache(user_id)
     
     return {
         "message": "Password reset successfully",
@@ -369,7 +447,7 @@ async def reset_user_password(
     }
 
 @app.get("/users/{user_id}/tickets", response_model=List[TicketWithRelations])
-async def get_user_tickets(
+def get_user_tickets(
     user_id: int,
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
@@ -381,78 +459,65 @@ async def get_user_tickets(
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Get all tickets created by this user
-    tickets = db.query(Ticket).filter(Ticket.creator == user_id).order_by(Ticket.creation_date.desc()).all()
+    # Get all tickets created by this user, loading their relations in batched queries
+    tickets = db.query(Ticket).options(
+        selectinload(Ticket.status),
+        selectinload(Ticket.crit),
+        selectinload(Ticket.center),
+        selectinload(Ticket.tool),
+        selectinload(Ticket.created_by_user),
+        selectinload(Ticket.notifier_user)
+    ).filter(Ticket.creator == user_id).order_by(Ticket.creation_date.desc()).all()
+    
+    # Batch query comment counts for all tickets
+    comment_counts = {}
+    if tickets:
+        comment_counts = dict(db.query(
+            Comment.ticket_id,
+            func.count(Comment.id)
+        ).filter(Comment.ticket_id.in_([ticket.id for ticket in tickets])).group_by(Comment.ticket_id).all())
     
-    # Convert to dictionaries with relations
-    ticket_dicts = []
+    # Serialize straight from the ORM objects instead of building intermediate dicts
+    ticket_models = []
     for ticket in tickets:
-        ticket_dict = {
-            "id": ticket.id,
-            "type": ticket.type,
-            "title": ticket.title,
-            "ticket_num": ticket.ticket_num,
-            "description": ticket.description,
-            "url": ticket.url,
-            "status_id": ticket.status_id,
-            "crit_id": ticket.crit_id,
-            "center_id": ticket.center_id,
-            "tool_id": ticket.tool_id,
-            "creation_date": ticket.creation_date.isoformat() if ticket.creation_date else None,
-            "modify_date": ticket.modify_date.isoformat() if ticket.modify_date else None,
-            "resolution_date": ticket.resolution_date.isoformat() if ticket.resolution_date else None,
-            "delete_date": ticket.delete_date.isoformat() if ticket.delete_date else None,
-            "modify_reason": ticket.modify_reason,
-            "notifier": ticket.notifier,
-            "people": ticket.people,
-            "creator": ticket.creator,
-            "pathway": ticket.pathway,
-            "supports": ticket.supports,
-            "attached": ticket.attached,
-            "comments_count": db.query(func.count(Comment.id)).filter(Comment.ticket_id == ticket.id).scalar() or 0,
-            "status": {
-                "id": ticket.status.id,
-                "value": ticket.status.value,
-                "desc": ticket.status.desc
-            } if ticket.status else None,
-            "crit": {
-                "id": ticket.crit.id,
-                "value": ticket.crit.value,
-                "desc": ticket.crit.desc
-            } if ticket.crit else None,
-            "center": {
-                "id": ticket.center.id,
-                "value": ticket.center.value,
-                "desc": ticket.center.desc
-            } if ticket.center else None,
-            "tool": {
-                "id": ticket.tool.id,
-                "value": ticket.tool.value,
-                "desc": ticket.tool.desc
-            } if ticket.tool else None,
-            "created_by_user": {
-                "id": ticket.created_by_user.id,
-                "username": ticket.created_by_user.username,
-                "email": ticket.created_by_user.email,
-                "permission_level": ticket.created_by_user.permission_level,
-                "is_active": ticket.created_by_user.is_active
-            } if ticket.created_by_user else None
-        }
-        ticket_dicts.append(ticket_dict)
+        ticket_model = TicketWithRelations.model_validate(ticket)
+        ticket_model.comments_count = comment_counts.get(ticket.id, 0)
+        ticket_models.append(ticket_model)
     
-    return ticket_dicts
+    return ticket_models
 
 # File upload endpoints
-@app.post("/tickets/{ticket_id}/upload")
-async def upload_files(
-    ticket_id: str,
-    files: List[UploadFile] = File(...),
-    current_user: User = Depends(get_current_complete_user),
-    db: Session = Depends(get_db)
-):
-    """Upload multiple file attachments to a ticket"""
-    check_permission(current_user, 2)  # Level 2+ can upload files
+def save_upload(file: UploadFile, file_path: str):
+    """Stream an upload to disk, returning its size and SHA256 hash"""
+    # Small files are read, hashed and written in one go
+    if file.size is not None and file.size < UPLOAD_CHUNK_SIZE:
+        data = file.file.read()
+        with open(file_path, "wb") as buffer:
+            buffer.write(data)
+        return len(data), hashlib.sha256(data).hexdigest()
     
+    hash_sha256 = hashlib.sha256()
+    file_size = 0
+    readinto = getattr(file.file, "readinto", None)
+    with open(file_path, "wb") as buffer:
+        if readinto is None:
+            # Spooled files only gained readinto in Python 3.11
+            while chunk := file.file.read(UPLOAD_CHUNK_SIZE):
+                buffer.write(chunk)
+                hash_sha256.update(chunk)
+                file_size += len(chunk)
+        else:
+            # Reuse one chunk buffer instead of allocating a new bytes object per read
+            chunk = bytearray(UPLOAD_CHUNK_SIZE)
+            view = memoryview(chunk)
+            while count := readinto(chunk):
+                buffer.write(view[:count])
+                hash_sha256.update(view[:count])
+                file_size += count
+    return file_size, hash_sha256.hexdigest()
+
+def attach_files_to_ticket(ticket_id: str, files: List[UploadFile], current_user: User, db: Session):
+    """Save uploads and attach them to a ticket; callers handle auth and permissions"""
     # Verify ticket exists
     db_ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
     if not db_ticket:
@@ -461,17 +526,16 @@ async def upload_files(
     if not files:
         raise HTTPException(status_code=400, detail="No files provided")
     
-    # Validate file types and sizes
-    MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB limit
-    ALLOWED_EXTENSIONS = {
-        '.pdf', '.doc', '.docx', '.txt', '.rtf',
-        '.jpg', '.jpeg', '.png', '.gif', '.bmp',
-        '.xls', '.xlsx', '.csv', '.ppt', '.pptx',
-        '.zip', '.rar', '.7z', '.tar', '.gz'
-    }
-    
     uploaded_files = []
     failed_uploads = []
+    pending = []  # Validated files waiting to be written
+    
+    # One timestamp for the whole batch, so every file lands in the same year/month folder
+    now = datetime.now()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
+    year_month = now.strftime("%Y/%m")
+    uploaded_at = now.isoformat()
+    ticket_upload_dir = os.path.join(TICKETS_UPLOADS_DIR, ticket_id, "attachments", year_month)
     
     try:
         for file in files:
@@ -494,26 +558,22 @@ async def upload_files(
                     continue
             
             # Generate unique filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             file_extension = os.path.splitext(file.filename)[1] if file.filename else ""
             safe_filename = "".join(c for c in file.filename if c.isalnum() or c in "._- ") if file.filename else "unknown"
             unique_filename = f"{timestamp}_{uuid.uuid4().hex[:8]}{file_extension}"
             
-            # Create organized directory structure: tickets/{ticket_id}/attachments/{year}/{month}/
-            year_month = datetime.now().strftime("%Y/%m")
-            ticket_upload_dir = os.path.join(TICKETS_UPLOADS_DIR, ticket_id, "attachments", year_month)
-            os.makedirs(ticket_upload_dir, exist_ok=True)
-            
             file_path = os.path.join(ticket_upload_dir, unique_filename)
-            
+            pending.append((file, file_path, unique_filename, file_extension))
+        
+        # Create organized directory structure: tickets/{ticket_id}/attachments/{year}/{month}/
+        if pending:
+            os.makedirs(ticket_upload_dir, exist_ok=True)
+        
+        # Write the accepted files to disk concurrently, then collect them in request order
+        futures = [UPLOAD_EXECUTOR.submit(save_upload, file, file_path) for file, file_path, *_ in pending]
+        for (file, file_path, unique_filename, file_extension), future in zip(pending, futures):
             try:
-                # Save file to disk
-                with open(file_path, "wb") as buffer:
-                    shutil.copyfileobj(file.file, buffer)
-                
-                # Get file metadata
-                file_size = os.path.getsize(file_path)
-                file_hash = calculate_file_hash(file_path)
+                file_size, file_hash = future.result()
                 
                 # Create file record
                 file_record = {
@@ -523,7 +583,7 @@ async def upload_files(
                     "size": file_size,
                     "hash": file_hash,
                     "uploaded_by": current_user.username,
-                    "uploaded_at": datetime.now().isoformat(),
+                    "uploaded_at": uploaded_at,
                     "file_type": file_extension.lower(),
                     "content_type": file.content_type or "application/octet-stream",
                     "ticket_id": ticket_id
@@ -552,12 +612,23 @@ async def upload_files(
             # Flag the JSON field as modified so SQLAlchemy detects the change
             flag_modified(db_ticket, "attached")
             
-            # First commit the ticket update
+            # Record the modification in the same transaction as the ticket update
+            file_names = [f["original_name"] for f in uploaded_files]
+            modification = Modification(
+                ticket_id=ticket_id,
+                user_id=current_user.id,
+                reason=f"Files uploaded: {', '.join(file_names)}",
+                field_name="attached",
+                old_value=str(len(old_attachments)),
+                new_value=str(len(current_attachments))
+            )
+            db.add(modification)
+            
             try:
                 db.commit()
-                print(f"DEBUG: Successfully updated ticket with {len(uploaded_files)} new files")
+                logger.debug("Ticket %s updated with %d new files", ticket_id, len(uploaded_files))
             except Exception as e:
-                print(f"DEBUG: Error updating ticket: {e}")
+                logger.exception("Error updating ticket %s after upload", ticket_id)
                 db.rollback()
                 # Clean up uploaded files if database update fails
                 for file_record in uploaded_files:
@@ -565,25 +636,6 @@ async def upload_files(
                     if os.path.exists(file_path):
                         os.remove(file_path)
                 raise HTTPException(status_code=500, detail=f"Error updating ticket: {str(e)}")
-            
-            # Now create the modification record
-            try:
-                file_names = [f["original_name"] for f in uploaded_files]
-                modification = Modification(
-                    ticket_id=ticket_id,
-                    user_id=current_user.id,
-                    reason=f"Files uploaded: {', '.join(file_names)}",
-                    field_name="attached",
-                    old_value=str(len(old_attachments)),
-                    new_value=str(len(current_attachments))
-                )
-                db.add(modification)
-                db.commit()
-                print(f"DEBUG: Successfully created modification: {modification.reason}")
-            except Exception as e:
-                print(f"DEBUG: Error creating modification: {e}")
-                # Don't rollback the ticket update, just log the error
-                print(f"WARNING: Files were uploaded but modification tracking failed: {e}")
         
         return {
             "message": f"Upload completed. {len(uploaded_files)} files uploaded successfully.",
@@ -602,28 +654,30 @@ async def upload_files(
         
         raise HTTPException(status_code=500, detail=f"Error during file upload: {str(e)}")
 
+@app.post("/tickets/{ticket_id}/upload")
+def upload_files(
+    ticket_id: str,
+    files: List[UploadFile] = File(...),
+    current_user: User = Depends(get_current_complete_user),
+    db: Session = Depends(get_db)
+):
+    """Upload multiple file attachments to a ticket"""
+    check_permission(current_user, 2)  # Level 2+ can upload files
+    return attach_files_to_ticket(ticket_id, files, current_user, db)
+
 @app.post("/tickets/{ticket_id}/upload-single")
-async def upload_single_file(
+def upload_single_file(
     ticket_id: str,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
 ):
     """Upload a single file attachment to a ticket (for backward compatibility)"""
-    result = await upload_files(ticket_id, [file], current_user, db)
-    return result
-
-def calculate_file_hash(file_path: str) -> str:
-    """Calculate SHA-256 hash of a file for integrity verification"""
-    import hashlib
-    hash_sha256 = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash_sha256.update(chunk)
-    return hash_sha256.hexdigest()
+    check_permission(current_user, 2)  # Level 2+ can upload files
+    return attach_files_to_ticket(ticket_id, [file], current_user, db)
 
 @app.get("/tickets/{ticket_id}/attachments")
-async def get_ticket_attachments(
+def get_ticket_attachments(
     ticket_id: str,
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
@@ -638,13 +692,21 @@ async def get_ticket_attachments(
     
     attachments = db_ticket.attached or []
     
+    # Stat each attachment folder once with scandir instead of exists+stat per file
+    dir_entries = {}
+    for parent in {os.path.dirname(att["path"]) for att in attachments}:
+        try:
+            with os.scandir(os.path.join(UPLOADS_DIR, parent)) as it:
+                dir_entries[parent] = {entry.name: entry.stat() for entry in it if entry.is_file()}
+        except OSError:
+            dir_entries[parent] = {}
+    
     # Add additional metadata
     enhanced_attachments = []
     for attachment in attachments:
-        file_path = os.path.join(UPLOADS_DIR, attachment["path"])
-        if os.path.exists(file_path):
-            # Get file modification time
-            stat_info = os.stat(file_path)
+        parent, name = os.path.split(attachment["path"])
+        stat_info = dir_entries[parent].get(name)
+        if stat_info:
             attachment["last_modified"] = datetime.fromtimestamp(stat_info.st_mtime).isoformat()
             attachment["file_exists"] = True
         else:
@@ -653,36 +715,51 @@ async def get_ticket_attachments(
         
         enhanced_attachments.append(attachment)
     
-    # Also check the ticket's upload directory structure
-    ticket_upload_dir = os.path.join(TICKETS_UPLOADS_DIR, ticket_id, "attachments")
-    directory_info = {}
-    if os.path.exists(ticket_upload_dir):
-        try:
-            for year_dir in os.listdir(ticket_upload_dir):
-                year_path = os.path.join(ticket_upload_dir, year_dir)
-                if os.path.isdir(year_path):
-                    month_info = {}
-                    for month_dir in os.listdir(year_path):
-                        month_path = os.path.join(year_path, month_dir)
-                        if os.path.isdir(month_path):
-                            files = os.listdir(month_path)
-                            month_info[month_dir] = files
-                    directory_info[year_dir] = month_info
-        except Exception as e:
-            print(f"DEBUG: Error reading directory structure: {e}")
-    
     return {
         "ticket_id": ticket_id,
         "total_attachments": len(enhanced_attachments),
         "total_size": sum(att.get("size", 0) for att in enhanced_attachments),
         "attachments": enhanced_attachments,
-        "directory_structure": directory_info
     }
 
+def attachment_file_response(request: Request, full_path: str, stat_result: os.stat_result,
+                             media_type: str, filename: Optional[str] = None) -> Response:
+    """Serve an attachment with cache validators, answering revalidations with 304"""
+    etag = f'W/"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "Cache-Control": "private, max-age=3600",
+    }
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    if UPLOADS_ACCEL_REDIRECT:
+        if filename:
+            quoted_filename = urllib.parse.quote(filename)
+            if quoted_filename != filename:
+                headers["Content-Disposition"] = f"attachment; filename*=utf-8''{quoted_filename}"
+            else:
+                headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return accel_redirect_response(full_path, headers, media_type)
+    return FileResponse(
+        path=full_path,
+        filename=filename,
+        media_type=media_type,
+        stat_result=stat_result,
+        headers=headers
+    )
+
+@lru_cache(maxsize=512)
+def guess_media_type(extension: str) -> str:
+    """Content type for a lowercase file extension, cached per extension"""
+    media_type, _ = mimetypes.guess_type("file" + extension)
+    return media_type or 'application/octet-stream'
+
 @app.get("/tickets/{ticket_id}/view/{file_path:path}")
-async def view_attachment(
+def view_attachment(
     ticket_id: str,
     file_path: str,
+    request: Request,
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
 ):
@@ -697,8 +774,10 @@ async def view_attachment(
     # Construct full file path
     full_path = os.path.join(UPLOADS_DIR, file_path)
     
-    # Verify file exists
-    if not os.path.exists(full_path):
+    # Verify file exists, keeping the stat so FileResponse doesn't repeat it
+    try:
+        stat_result = os.stat(full_path)
+    except OSError:
         raise HTTPException(status_code=404, detail="File not found")
     
     # Verify the file belongs to this ticket (security check)
@@ -714,21 +793,16 @@ async def view_attachment(
         media_type = attachment.get("content_type")
     else:
         # Infer content type from file extension
-        import mimetypes
-        media_type, _ = mimetypes.guess_type(full_path)
-        if not media_type:
-            media_type = 'application/octet-stream'
+        media_type = guess_media_type(os.path.splitext(full_path)[1].lower())
     
     # Return file for inline viewing (no filename parameter = inline display)
-    return FileResponse(
-        path=full_path,
-        media_type=media_type
-    )
+    return attachment_file_response(request, full_path, stat_result, media_type)
 
 @app.get("/tickets/{ticket_id}/download/{file_path:path}")
-async def download_attachment(
+def download_attachment(
     ticket_id: str,
     file_path: str,
+    request: Request,
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
 ):
@@ -743,8 +817,10 @@ async def download_attachment(
     # Construct full file path
     full_path = os.path.join(UPLOADS_DIR, file_path)
     
-    # Verify file exists
-    if not os.path.exists(full_path):
+    # Verify file exists, keeping the stat so FileResponse doesn't repeat it
+    try:
+        stat_result = os.stat(full_path)
+    except OSError:
         raise HTTPException(status_code=404, detail="File not found")
     
     # Verify the file belongs to this ticket (security check)
@@ -762,33 +838,26 @@ async def download_attachment(
         media_type = attachment.get("content_type")
     else:
         # Infer content type from file extension
-        import mimetypes
-        media_type, _ = mimetypes.guess_type(full_path)
-        if not media_type:
-            media_type = 'application/octet-stream'
+        media_type = guess_media_type(os.path.splitext(full_path)[1].lower())
     
-    return FileResponse(
-        path=full_path,
-        filename=filename,
-        media_type=media_type
-    )
+    return attachment_file_response(request, full_path, stat_result, media_type, filename=filename)
 
 @app.delete("/tickets/{ticket_id}/attachments/{filename:path}")
-async def delete_attachment(
+def delete_attachment(
     ticket_id: str,
     filename: str,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
 ):
     """Delete a file attachment from a ticket"""
-    print(f"DEBUG: Delete attachment called by user {current_user.username} with permission level {current_user.permission_level}")
+    logger.debug("Delete attachment called by user %s with permission level %s", current_user.username, current_user.permission_level)
     check_permission(current_user, 2)  # Level 1 (admin) or 2 (editor) can delete files
     
     # Decode the URL-encoded filename
-    import urllib.parse
     decoded_filename = urllib.parse.unquote(filename)
-    print(f"DEBUG: Original filename parameter: {filename}")
-    print(f"DEBUG: Decoded filename: {decoded_filename}")
+    logger.debug("Original filename parameter: %s", filename)
+    logger.debug("Decoded filename: %s", decoded_filename)
     
     # Verify ticket exists
     db_ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
@@ -797,82 +866,79 @@ async def delete_attachment(
     
     # Find and remove attachment
     current_attachments = db_ticket.attached or []
-    attachment_to_remove = None
     
-    print(f"DEBUG: Looking for attachment with filename: {decoded_filename}")
-    print(f"DEBUG: Current attachments: {current_attachments}")
+    logger.debug("Looking for attachment with filename: %s", decoded_filename)
+    logger.debug("Current attachments: %s", current_attachments)
     
     # The filename parameter is actually the path from the attachment object
-    for attachment in current_attachments:
-        print(f"DEBUG: Checking attachment: {attachment}")
-        if attachment.get("path") == decoded_filename:
-            attachment_to_remove = attachment
-            print(f"DEBUG: Found attachment by path: {attachment}")
-            break
+    attachments_by_path = {attachment.get("path"): attachment for attachment in current_attachments}
+    attachment_to_remove = attachments_by_path.get(decoded_filename)
     
     if not attachment_to_remove:
-        # Try to find by original_name as fallback
-        print(f"DEBUG: Not found by path, trying original_name")
-        for attachment in current_attachments:
-            if attachment.get("original_name") == decoded_filename:
-                attachment_to_remove = attachment
-                print(f"DEBUG: Found attachment by original_name: {attachment}")
-                break
+        # Try to find by original_name as fallback (first match wins)
+        logger.debug("Not found by path, trying original_name")
+        attachment_to_remove = next(
+            (attachment for attachment in current_attachments if attachment.get("original_name") == decoded_filename),
+            None
+        )
     
     if not attachment_to_remove:
-        print(f"DEBUG: Attachment not found")
+        logger.debug("Attachment not found")
         raise HTTPException(status_code=404, detail="Attachment not found")
+    logger.debug("Found attachment: %s", attachment_to_remove)
     
     # Remove file from disk
     file_path = os.path.join(UPLOADS_DIR, attachment_to_remove["path"])
-    print(f"DEBUG: UPLOADS_DIR: {UPLOADS_DIR}")
-    print(f"DEBUG: Attachment path: {attachment_to_remove['path']}")
-    print(f"DEBUG: Full file path: {file_path}")
-    print(f"DEBUG: File exists: {os.path.exists(file_path)}")
     
-    # List directory contents for debugging
-    try:
-        upload_dir = os.path.dirname(file_path)
-        if os.path.exists(upload_dir):
-            print(f"DEBUG: Directory contents of {upload_dir}: {os.listdir(upload_dir)}")
-        else:
-            print(f"DEBUG: Directory {upload_dir} does not exist")
-    except Exception as e:
-        print(f"DEBUG: Error listing directory: {e}")
+    # Path and directory dumps cost extra syscalls, so only gather them when debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("UPLOADS_DIR: %s", UPLOADS_DIR)
+        logger.debug("Attachment path: %s", attachment_to_remove['path'])
+        logger.debug("Full file path: %s", file_path)
+        logger.debug("File exists: %s", os.path.exists(file_path))
+        
+        # List directory contents for debugging
+        try:
+            upload_dir = os.path.dirname(file_path)
+            if os.path.exists(upload_dir):
+                logger.debug("Directory contents of %s: %s", upload_dir, os.listdir(upload_dir))
+            else:
+                logger.debug("Directory %s does not exist", upload_dir)
+        except Exception as e:
+            logger.debug("Error listing directory: %s", e)
+        
+        # Also check the ticket-specific directory
+        try:
+            ticket_upload_dir = os.path.join(TICKETS_UPLOADS_DIR, ticket_id, "attachments")
+            if os.path.exists(ticket_upload_dir):
+                logger.debug("Ticket upload directory contents: %s", os.listdir(ticket_upload_dir))
+                for year_dir in os.listdir(ticket_upload_dir):
+                    year_path = os.path.join(ticket_upload_dir, year_dir)
+                    if os.path.isdir(year_path):
+                        month_dirs = os.listdir(year_path)
+                        logger.debug("Year %s contains months: %s", year_dir, month_dirs)
+                        for month_dir in month_dirs:
+                            month_path = os.path.join(year_path, month_dir)
+                            if os.path.isdir(month_path):
+                                files = os.listdir(month_path)
+                                logger.debug("Month %s contains files: %s", month_dir, files)
+        except Exception as e:
+            logger.debug("Error listing ticket directory: %s", e)
     
-    # Also check the ticket-specific directory
     try:
-        ticket_upload_dir = os.path.join(TICKETS_UPLOADS_DIR, ticket_id, "attachments")
-        if os.path.exists(ticket_upload_dir):
-            print(f"DEBUG: Ticket upload directory contents: {os.listdir(ticket_upload_dir)}")
-            for year_dir in os.listdir(ticket_upload_dir):
-                year_path = os.path.join(ticket_upload_dir, year_dir)
-                if os.path.isdir(year_path):
-                    month_dirs = os.listdir(year_path)
-                    print(f"DEBUG: Year {year_dir} contains months: {month_dirs}")
-                    for month_dir in month_dirs:
-                        month_path = os.path.join(year_path, month_dir)
-                        if os.path.isdir(month_path):
-                            files = os.listdir(month_path)
-                            print(f"DEBUG: Month {month_dir} contains files: {files}")
-    except Exception as e:
-        print(f"DEBUG: Error listing ticket directory: {e}")
-    
-    if os.path.exists(file_path):
-        try:
-            os.remove(file_path)
-            print(f"DEBUG: Successfully deleted file from disk")
-        except OSError as e:
-            print(f"DEBUG: Error deleting file from disk: {e}")
-            raise HTTPException(status_code=500, detail=f"Error deleting file: {str(e)}")
-    else:
-        print(f"DEBUG: File does not exist on disk, but continuing with database update")
+        os.remove(file_path)
+        logger.debug("Successfully deleted file from disk")
+    except FileNotFoundError:
+        logger.debug("File does not exist on disk, but continuing with database update")
+    except OSError as e:
+        logger.error("Error deleting file from disk: %s", e)
+        raise HTTPException(status_code=500, detail=f"Error deleting file: {str(e)}")
     
     # Remove from database
-    print(f"DEBUG: Removing attachment from database: {attachment_to_remove}")
+    logger.debug("Removing attachment from database: %s", attachment_to_remove)
     current_attachments.remove(attachment_to_remove)
     db_ticket.attached = current_attachments
-    print(f"DEBUG: Updated attachments list: {db_ticket.attached}")
+    logger.debug("Updated attachments list: %s", db_ticket.attached)
     
     # Flag the JSON field as modified so SQLAlchemy detects the change
     flag_modified(db_ticket, "attached")
@@ -880,15 +946,15 @@ async def delete_attachment(
     # First commit the ticket update
     try:
         db.commit()
-        print(f"DEBUG: Successfully updated ticket after file deletion")
+        logger.debug("Successfully updated ticket after file deletion")
     except Exception as e:
-        print(f"DEBUG: Error updating ticket: {e}")
+        logger.error("Error updating ticket: %s", e)
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error updating ticket: {str(e)}")
     
     # Now create the modification record
     try:
-        print(f"DEBUG: Creating modification record")
+        logger.debug("Creating modification record")
         modification = Modification(
             ticket_id=ticket_id,
             user_id=current_user.id,
@@ -899,19 +965,16 @@ async def delete_attachment(
         )
         db.add(modification)
         db.commit()
-        print(f"DEBUG: Successfully created modification: {modification.reason}")
+        logger.debug("Successfully created modification: %s", modification.reason)
     except Exception as e:
-        print(f"DEBUG: Error creating modification: {e}")
+        logger.error("Error creating modification: %s", e)
         # Don't rollback the ticket update, just log the error
-        print(f"WARNING: File was deleted but modification tracking failed: {e}")
+        logger.warning("File was deleted but modification tracking failed: %s", e)
     
-    # Clean up empty directories
-    try:
-        cleanup_empty_directories(ticket_id, attachment_to_remove["path"])
-    except Exception as e:
-        print(f"DEBUG: Warning: Failed to cleanup directories: {e}")
+    # Clean up empty directories once the response has been sent
+    background_tasks.add_task(cleanup_empty_directories, ticket_id, attachment_to_remove["path"])
     
-    print(f"DEBUG: Returning success response")
+    logger.debug("Returning success response")
     return {
         "message": "Attachment deleted successfully",
         "deleted_file": attachment_to_remove["filename"],
@@ -920,7 +983,7 @@ async def delete_attachment(
 
 # Ticket endpoints
 @app.post("/tickets/", response_model=TicketModel)
-async def create_ticket(
+def create_ticket(
     ticket: TicketCreate,
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
@@ -949,11 +1012,139 @@ async def create_ticket(
     db_ticket = Ticket(id=ticket_id, **ticket_data)
     db.add(db_ticket)
     db.commit()
+    invalidate_dashboard_cache()
     db.refresh(db_ticket)
     return db_ticket
 
+# Statuses hidden from the ticket list unless show_hidden is set
+HIDDEN_STATUS_VALUES = ('discarted', 'solved', 'closed', 'deleted')
+_hidden_status_ids: Optional[frozenset] = None
+
+def get_hidden_status_ids(db: Session) -> frozenset:
+    """IDs of the hidden statuses, loaded once and reused until statuses change"""
+    global _hidden_status_ids
+    status_ids = _hidden_status_ids
+    if status_ids is None:
+        rows = db.query(Status.id).filter(Status.value.in_(HIDDEN_STATUS_VALUES)).all()
+        if not rows:
+            # Statuses not seeded yet; don't cache the empty result
+            return frozenset()
+        status_ids = _hidden_status_ids = frozenset(row.id for row in rows)
+    return status_ids
+
+_open_status_ids: Optional[frozenset] = None
+
+def get_open_status_ids(db: Session) -> frozenset:
+    """IDs of the statuses counted as open (every status that isn't hidden)"""
+    global _open_status_ids
+    status_ids = _open_status_ids
+    if status_ids is None:
+        rows = db.query(Status.id).filter(~Status.value.in_(HIDDEN_STATUS_VALUES)).all()
+        if not rows:
+            return frozenset()
+        status_ids = _open_status_ids = frozenset(row.id for row in rows)
+    return status_ids
+
+# Status/crit/center/tool rows serialized once, keyed by id. The app's own writes
+# invalidate them; the TTL picks up rows edited outside it (scripts, other workers)
+REFERENCE_MODELS = {"status": Status, "crit": Crit, "center": Center, "tool": Tool}
+REFERENCE_CACHE_TTL = 300  # seconds
+_reference_lookups: Optional[dict] = None
+_reference_lookups_expire_at = 0.0
+
+def get_reference_entry(db: Session, kind: str, entry_id: Optional[int]) -> Optional[dict]:
+    """{id, value, desc} for a reference row, served from the in-memory lookup tables"""
+    global _reference_lookups, _reference_lookups_expire_at
+    if entry_id is None:
+        return None
+    now = time.monotonic()
+    # Work on a local copy: another thread may reset the global while we read it
+    lookups = _reference_lookups
+    expired = lookups is None or now >= _reference_lookups_expire_at
+    if expired or entry_id not in lookups[kind]:
+        # First use, expired, or an id not seen since the tables were loaded (a row
+        # added outside the app)
+        fresh = {
+            name: {row.id: {"id": row.id, "value": row.value, "desc": row.desc}
+                   for row in db.query(model.id, model.value, model.desc)}
+            for name, model in REFERENCE_MODELS.items()
+        }
+        if expired:
+            _reference_lookups_expire_at = now + REFERENCE_CACHE_TTL
+        else:
+            # Keep the ids already known to be missing until the tables expire
+            for name, table in lookups.items():
+                for missing_id in [key for key, entry in table.items() if entry is None]:
+                    fresh[name].setdefault(missing_id, None)
+        # Remember an id that still doesn't exist, so tickets pointing at a deleted
+        # row don't reload the tables on every lookup
+        fresh[kind].setdefault(entry_id, None)
+        lookups = _reference_lookups = fresh
+    return lookups[kind].get(entry_id)
+
+def invalidate_reference_caches():
+    """Forget the cached reference data after statuses/crits/centers/tools are added"""
+    global _hidden_status_ids, _open_status_ids, _reference_lookups, _reference_version
+    _reference_version += 1
+    _hidden_status_ids = None
+    _open_status_ids = None
+    _reference_lookups = None
+    invalidate_dashboard_cache()
+
+def json_model_response(model: BaseModel) -> Response:
+    """Send an already-validated model as JSON, skipping FastAPI's second validate/encode pass"""
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+# Ticket serialization shared by the list and detail endpoints
+USER_SUMMARY_FIELDS = ("id", "username", "email", "permission_level", "is_active")
+_get_user_summary = attrgetter(*USER_SUMMARY_FIELDS)
+
+def serialize_user_summary(user: Optional[User]) -> Optional[dict]:
+    """Compact user dict embedded in ticket responses"""
+    if user is None:
+        return None
+    return dict(zip(USER_SUMMARY_FIELDS, _get_user_summary(user)))
+
+def serialize_ticket(db: Session, ticket: Ticket, comments_count: int) -> dict:
+    """Build the TicketWithRelations payload for a ticket"""
+    creation_date = ticket.creation_date
+    modify_date = ticket.modify_date
+    resolution_date = ticket.resolution_date
+    delete_date = ticket.delete_date
+    notifier = ticket.notifier
+    return {
+        "id": ticket.id,
+        "type": ticket.type,
+        "title": ticket.title,
+        "ticket_num": ticket.ticket_num,
+        "description": ticket.description,
+        "url": ticket.url,
+        "status_id": ticket.status_id,
+        "crit_id": ticket.crit_id,
+        "center_id": ticket.center_id,
+        "tool_id": ticket.tool_id,
+        "creation_date": creation_date.isoformat() if creation_date else None,
+        "modify_date": modify_date.isoformat() if modify_date else None,
+        "resolution_date": resolution_date.isoformat() if resolution_date else None,
+        "delete_date": delete_date.isoformat() if delete_date else None,
+        "modify_reason": ticket.modify_reason,
+        "notifier": notifier if isinstance(notifier, int) else None,
+        "people": ticket.people or [],
+        "creator": ticket.creator,
+        "pathway": ticket.pathway,
+        "supports": ticket.supports,
+        "attached": ticket.attached,
+        "comments_count": comments_count,
+        "status": get_reference_entry(db, "status", ticket.status_id),
+        "crit": get_reference_entry(db, "crit", ticket.crit_id),
+        "center": get_reference_entry(db, "center", ticket.center_id),
+        "tool": get_reference_entry(db, "tool", ticket.tool_id),
+        "created_by_user": serialize_user_summary(ticket.created_by_user),
+        "notifier_user": serialize_user_summary(ticket.notifier_user)
+    }
+
 @app.get("/tickets/", response_model=TicketListResponse)
-async def get_tickets(
+def get_tickets(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     status_id: Optional[int] = None,
@@ -970,7 +1161,16 @@ async def get_tickets(
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
 ):
-    query = db.query(Ticket)
+    # Load the user relations in one IN (...) query each, not per row; the reference
+    # rows (status/crit/center/tool) come from the in-memory lookup tables
+    query = db.query(Ticket).options(
+        noload(Ticket.status),
+        noload(Ticket.crit),
+        noload(Ticket.center),
+        noload(Ticket.tool),
+        selectinload(Ticket.created_by_user),
+        selectinload(Ticket.notifier_user)
+    )
     
     # Apply regular filters first
     if status_id:
@@ -980,11 +1180,7 @@ async def get_tickets(
     
     # Filter out hidden statuses by default (discarted, solved, closed, deleted)
     if not show_hidden:
-        # Get status IDs for hidden statuses
-        hidden_statuses = db.query(Status).filter(
-            Status.value.in_(['discarted', 'solved', 'closed', 'deleted'])
-        ).all()
-        hidden_status_ids = [s.id for s in hidden_statuses]
+        hidden_status_ids = get_hidden_status_ids(db)
         if hidden_status_ids:
             query = query.filter(~Ticket.status_id.in_(hidden_status_ids))
     if crit_id:
@@ -1002,43 +1198,12 @@ async def get_tickets(
     if search and search.strip():
         search_term = f"%{search.strip().lower()}%"
         
-        # First, save all the filters we've already applied
-        # Create a subquery to find matching ticket IDs with search
-        # Label the ID column explicitly
-        search_query = db.query(Ticket.id.label('ticket_id'))
-        
-        # Apply all the same filters to the search subquery
-        if status_id:
-            search_query = search_query.filter(Ticket.status_id == status_id)
-        if type:
-            search_query = search_query.filter(Ticket.type == type)
-        
-        # Apply hidden status filter to search subquery too
-        if not show_hidden:
-            hidden_statuses = db.query(Status).filter(
-                Status.value.in_(['discarted', 'solved', 'closed', 'deleted'])
-            ).all()
-            hidden_status_ids = [s.id for s in hidden_statuses]
-            if hidden_status_ids:
-                search_query = search_query.filter(~Ticket.status_id.in_(hidden_status_ids))
-        
-        if crit_id:
-            search_query = search_query.filter(Ticket.crit_id == crit_id)
-        if tool_id:
-            search_query = search_query.filter(Ticket.tool_id == tool_id)
-        if center_id:
-            search_query = search_query.filter(Ticket.center_id == center_id)
-        if date_from:
-            search_query = search_query.filter(Ticket.creation_date >= date_from)
-        if date_to:
-            search_query = search_query.filter(Ticket.creation_date <= date_to)
-        
-        # Join tables needed for search
-        from sqlalchemy.orm import aliased
+        # Join the tables needed for search straight onto the main query; every join is
+        # many-to-one, so no ticket row is duplicated and no DISTINCT is needed
         NotifierUser = aliased(User)
-        search_query = search_query.join(User, Ticket.creator == User.id)
-        search_query = search_query.join(Tool, Ticket.tool_id == Tool.id)
-        search_query = search_query.outerjoin(NotifierUser, Ticket.notifier == NotifierUser.id)
+        query = query.join(User, Ticket.creator == User.id)
+        query = query.join(Tool, Ticket.tool_id == Tool.id)
+        query = query.outerjoin(NotifierUser, Ticket.notifier == NotifierUser.id)
         
         # Build search conditions
         search_conditions = [
@@ -1046,7 +1211,7 @@ async def get_tickets(
             func.lower(Ticket.description).like(search_term),
             func.lower(Tool.desc).like(search_term),
             func.lower(User.username).like(search_term),
-            func.lower(Ticket.id).like(search_term),  # Search in ticket ID
+            Ticket.id.like(search_term.upper()),  # Ticket IDs are generated uppercase (INC/SUG + hex)
         ]
         
         # Handle notifier search by username
@@ -1068,20 +1233,10 @@ async def get_tickets(
         people_search = func.lower(func.cast(Ticket.people, String)).like(search_term)
         search_conditions.append(people_search)
         
-        # Apply search filter and get distinct ticket IDs
-        matching_ticket_ids = search_query.filter(or_(*search_conditions)).distinct().subquery()
-        
-        # Filter main query by matching ticket IDs
-        # Use the labeled column name
-        query = query.filter(Ticket.id.in_(select(matching_ticket_ids.c.ticket_id)))
+        # Apply search filter
+        query = query.filter(or_(*search_conditions))
     
     # Apply sorting
-    # Track which tables we've already joined for search
-    joined_tables = set()
-    if search and search.strip():
-        joined_tables.add('User')
-        joined_tables.add('Tool')
-    
     if sort_by:
         if sort_by == 'creation_date':
             if sort_order == 'desc':
@@ -1099,26 +1254,29 @@ async def get_tickets(
             else:
                 query = query.order_by(Ticket.ticket_num.asc())
         elif sort_by == 'status':
-            # Only join if not already joined
-            if 'Status' not in joined_tables:
-                query = query.join(Status)
-                joined_tables.add('Status')
+            # Ordering is by status id, which the ticket row already holds
             if sort_order == 'desc':
-                query = query.order_by(Status.id.desc())
+                query = query.order_by(Ticket.status_id.desc())
             else:
-                query = query.order_by(Status.id.asc())
+                query = query.order_by(Ticket.status_id.asc())
         elif sort_by == 'priority':
-            # Only join if not already joined
-            if 'Crit' not in joined_tables:
-                query = query.join(Crit)
-                joined_tables.add('Crit')
+            # Ordering is by crit id, which the ticket row already holds
             if sort_order == 'desc':
-                query = query.order_by(Crit.id.desc())
+                query = query.order_by(Ticket.crit_id.desc())
             else:
-                query = query.order_by(Crit.id.asc())
-    
-    total = query.count()
-    tickets = query.offset(skip).limit(limit).all()
+                query = query.order_by(Ticket.crit_id.asc())
+        # Break ties on the primary key so rows sharing a sort value keep the same
+        # position from one OFFSET page to the next
+        query = query.order_by(Ticket.id)
+    
+    # Fetch the page and the total match count in one query with COUNT(*) OVER ()
+    rows = query.add_columns(func.count().over().label("total")).offset(skip).limit(limit).all()
+    tickets = [row[0] for row in rows]
+    if rows:
+        total = rows[0].total
+    else:
+        # Past the last page the window has no row to report on
+        total = query.count() if skip else 0
     
     # Get all ticket IDs for batch comment count query
     ticket_ids = [ticket.id for ticket in tickets]
@@ -1133,151 +1291,41 @@ async def get_tickets(
         comment_counts = {ticket_id: count for ticket_id, count in comment_count_query}
     
     # Convert SQLAlchemy objects to dictionaries for Pydantic
-    ticket_dicts = []
-    for ticket in tickets:
-        ticket_dict = {
-            "id": ticket.id,
-            "type": ticket.type,
-            "title": ticket.title,
-            "ticket_num": ticket.ticket_num,
-            "description": ticket.description,
-            "url": ticket.url,
-            "status_id": ticket.status_id,
-            "crit_id": ticket.crit_id,
-            "center_id": ticket.center_id,
-            "tool_id": ticket.tool_id,
-            "creation_date": ticket.creation_date.isoformat() if ticket.creation_date else None,
-            "modify_date": ticket.modify_date.isoformat() if ticket.modify_date else None,
-            "resolution_date": ticket.resolution_date.isoformat() if ticket.resolution_date else None,
-            "delete_date": ticket.delete_date.isoformat() if ticket.delete_date else None,
-            "modify_reason": ticket.modify_reason,
-            "notifier": ticket.notifier if isinstance(ticket.notifier, int) else None,
-            "people": ticket.people if ticket.people else [],
-            "creator": ticket.creator,
-            "pathway": ticket.pathway,
-            "supports": ticket.supports,
-            "attached": ticket.attached,
-            "comments_count": comment_counts.get(ticket.id, 0),
-            "status": {
-                "id": ticket.status.id,
-                "value": ticket.status.value,
-                "desc": ticket.status.desc
-            } if ticket.status else None,
-            "crit": {
-                "id": ticket.crit.id,
-                "value": ticket.crit.value,
-                "desc": ticket.crit.desc
-            } if ticket.crit else None,
-            "center": {
-                "id": ticket.center.id,
-                "value": ticket.center.value,
-                "desc": ticket.center.desc
-            } if ticket.center else None,
-            "tool": {
-                "id": ticket.tool.id,
-                "value": ticket.tool.value,
-                "desc": ticket.tool.desc
-            } if ticket.tool else None,
-            "created_by_user": {
-                "id": ticket.created_by_user.id,
-                "username": ticket.created_by_user.username,
-                "email": ticket.created_by_user.email,
-                "permission_level": ticket.created_by_user.permission_level,
-                "is_active": ticket.created_by_user.is_active
-            } if ticket.created_by_user else None,
-            "notifier_user": {
-                "id": ticket.notifier_user.id,
-                "username": ticket.notifier_user.username,
-                "email": ticket.notifier_user.email,
-                "permission_level": ticket.notifier_user.permission_level,
-                "is_active": ticket.notifier_user.is_active
-            } if ticket.notifier_user else None
-        }
-        ticket_dicts.append(ticket_dict)
+    ticket_dicts = [serialize_ticket(db, ticket, comment_counts.get(ticket.id, 0)) for ticket in tickets]
     
-    return TicketListResponse(
+    response = TicketListResponse(
         tickets=ticket_dicts,
         total=total,
         page=skip // limit + 1,
         size=limit
     )
+    return json_model_response(response)
 
 @app.get("/tickets/{ticket_id}", response_model=TicketWithRelations)
-async def get_ticket(
+def get_ticket(
     ticket_id: str,
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
 ):
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    # A single row, so join its user relations into the same SELECT
+    ticket = db.query(Ticket).options(
+        noload(Ticket.status),
+        noload(Ticket.crit),
+        noload(Ticket.center),
+        noload(Ticket.tool),
+        joinedload(Ticket.created_by_user),
+        joinedload(Ticket.notifier_user)
+    ).filter(Ticket.id == ticket_id).first()
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
     
     # Get comment count for this ticket
     comments_count = db.query(func.count(Comment.id)).filter(Comment.ticket_id == ticket_id).scalar() or 0
     
-    # Convert SQLAlchemy object to dictionary for Pydantic
-    ticket_dict = {
-        "id": ticket.id,
-        "type": ticket.type,
-        "title": ticket.title,
-        "ticket_num": ticket.ticket_num,
-        "description": ticket.description,
-        "url": ticket.url,
-        "status_id": ticket.status_id,
-        "crit_id": ticket.crit_id,
-        "center_id": ticket.center_id,
-        "tool_id": ticket.tool_id,
-        "creation_date": ticket.creation_date.isoformat() if ticket.creation_date else None,
-        "modify_date": ticket.modify_date.isoformat() if ticket.modify_date else None,
-        "resolution_date": ticket.resolution_date.isoformat() if ticket.resolution_date else None,
-        "delete_date": ticket.delete_date.isoformat() if ticket.delete_date else None,
-        "modify_reason": ticket.modify_reason,
-        "notifier": ticket.notifier if isinstance(ticket.notifier, int) else None,
-        "people": ticket.people if ticket.people else [],
-        "creator": ticket.creator,
-        "pathway": ticket.pathway,
-        "supports": ticket.supports,
-        "attached": ticket.attached,
-        "comments_count": comments_count,
-        "status": {
-            "id": ticket.status.id,
-            "value": ticket.status.value,
-            "desc": ticket.status.desc
-        } if ticket.status else None,
-        "crit": {
-            "id": ticket.crit.id,
-            "value": ticket.crit.value,
-            "desc": ticket.crit.desc
-        } if ticket.crit else None,
-        "center": {
-            "id": ticket.center.id,
-            "value": ticket.center.value,
-            "desc": ticket.center.desc
-        } if ticket.center else None,
-        "tool": {
-            "id": ticket.tool.id,
-            "value": ticket.tool.value,
-            "desc": ticket.tool.desc
-        } if ticket.tool else None,
-        "created_by_user": {
-            "id": ticket.created_by_user.id,
-            "username": ticket.created_by_user.username,
-            "email": ticket.created_by_user.email,
-            "permission_level": ticket.created_by_user.permission_level,
-            "is_active": ticket.created_by_user.is_active
-        } if ticket.created_by_user else None,
-        "notifier_user": {
-            "id": ticket.notifier_user.id,
-            "username": ticket.notifier_user.username,
-            "email": ticket.notifier_user.email,
-            "permission_level": ticket.notifier_user.permission_level,
-            "is_active": ticket.notifier_user.is_active
-        } if ticket.notifier_user else None
-    }
-    return ticket_dict
+    return json_model_response(TicketWithRelations.model_validate(serialize_ticket(db, ticket, comments_count)))
 
 @app.put("/tickets/{ticket_id}", response_model=TicketModel)
-async def update_ticket(
+def update_ticket(
     ticket_id: str,
     ticket_update: TicketUpdate,
     current_user: User = Depends(get_current_complete_user),
@@ -1289,25 +1337,12 @@ async def update_ticket(
     if not db_ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
     
-    # Store original values for comparison
-    original_values = {
-        'ticket_num': db_ticket.ticket_num,
-        'type': db_ticket.type,
-        'title': db_ticket.title,
-        'description': db_ticket.description,
-        'url': db_ticket.url,
-        'status_id': db_ticket.status_id,
-        'crit_id': db_ticket.crit_id,
-        'center_id': db_ticket.center_id,
-        'tool_id': db_ticket.tool_id,
-        'notifier': db_ticket.notifier,
-        'people': db_ticket.people,
-        'pathway': db_ticket.pathway,
-        'attached': db_ticket.attached
-    }
-    
     update_data = ticket_update.model_dump(exclude_unset=True)
     
+    # Store original values for comparison, only for the fields being updated, so the
+    # attached JSON list is only touched when the update actually includes it
+    original_values = {field: getattr(db_ticket, field) for field in update_data}
+    
     # Handle optional center_id
     if 'center_id' in update_data and update_data['center_id'] == 0:
         update_data['center_id'] = None
@@ -1316,6 +1351,12 @@ async def update_ticket(
     if 'people' in update_data and update_data['people'] is None:
         update_data['people'] = []
     
+    # Keep only the fields whose value actually changes; an echo of the current ticket
+    # is a no-op and doesn't touch modify_date or open a write transaction
+    update_data = {field: value for field, value in update_data.items() if original_values[field] != value}
+    if not update_data:
+        return db_ticket
+    
     # Validate status transition if status is being changed
     if 'status_id' in update_data and update_data['status_id'] != db_ticket.status_id:
         current_status = db.query(Status).filter(Status.id == db_ticket.status_id).first()
@@ -1347,7 +1388,8 @@ async def update_ticket(
     # Update modify_date
     update_data['modify_date'] = datetime.now()
     
-    # Track changes and create modifications
+    # Track changes and collect modification rows for a single bulk insert
+    modifications = []
     for field, new_value in update_data.items():
         if field in ['modify_date', 'resolution_date', 'delete_date']:
             continue  # Skip auto-generated fields
@@ -1375,35 +1417,36 @@ async def update_ticket(
                     # Files were removed
                     reason = f"Files removed ({old_count - new_count} files)"
                 
-                modification = Modification(
-                    ticket_id=ticket_id,
-                    user_id=current_user.id,
-                    reason=reason,
-                    field_name=field,
-                    old_value=str(old_count),
-                    new_value=str(new_count)
-                )
-                db.add(modification)
+                modifications.append({
+                    "ticket_id": ticket_id,
+                    "user_id": current_user.id,
+                    "reason": reason,
+                    "field_name": field,
+                    "old_value": str(old_count),
+                    "new_value": str(new_count)
+                })
         elif old_value != new_value:
             # Create modification record for other fields
-            modification = Modification(
-                ticket_id=ticket_id,
-                user_id=current_user.id,
-                reason=f"Updated {field}",
-                field_name=field,
-                old_value=str(old_value) if old_value is not None else "",
-                new_value=str(new_value) if new_value is not None else ""
-            )
-            db.add(modification)
+            modifications.append({
+                "ticket_id": ticket_id,
+                "user_id": current_user.id,
+                "reason": f"Updated {field}",
+                "field_name": field,
+                "old_value": str(old_value) if old_value is not None else "",
+                "new_value": str(new_value) if new_value is not None else ""
+            })
         
         setattr(db_ticket, field, new_value)
     
+    if modifications:
+        db.bulk_insert_mappings(Modification, modifications)
     db.commit()
+    invalidate_dashboard_cache()
     db.refresh(db_ticket)
     return db_ticket
 
 @app.delete("/tickets/{ticket_id}")
-async def delete_ticket(
+def delete_ticket(
     ticket_id: str,
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
@@ -1417,11 +1460,12 @@ async def delete_ticket(
     # Soft delete - set delete_date instead of removing
     db_ticket.delete_date = datetime.now().date()
     db.commit()
+    invalidate_dashboard_cache()
     return {"message": "Ticket deleted successfully"}
 
 # Modification endpoints
 @app.post("/modifications/", response_model=ModificationModel)
-async def create_modification(
+def create_modification(
     modification: ModificationCreate,
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
@@ -1438,8 +1482,10 @@ async def create_modification(
     return db_modification
 
 @app.get("/tickets/{ticket_id}/modifications", response_model=GroupedModificationListResponse)
-async def get_ticket_modifications(
+def get_ticket_modifications(
     ticket_id: str,
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
 ):
@@ -1448,24 +1494,40 @@ async def get_ticket_modifications(
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
     
-    modifications = db.query(Modification).filter(Modification.ticket_id == ticket_id).order_by(Modification.date.desc()).all()
+    # Stream rows in batches; every group is counted for the total, but changes are
+    # only described for the groups on the requested page
+    modifications = (
+        db.query(Modification)
+        .options(selectinload(Modification.user))
+        .filter(Modification.ticket_id == ticket_id)
+        .order_by(Modification.date.desc())
+        .yield_per(200)
+    )
     
     # Group modifications by timestamp (within 1 second)
     grouped_modifications = []
     current_group = None
+    group_date = None
+    total_groups = 0
     
     for mod in modifications:
-        if current_group is None or abs((mod.date - current_group['date']).total_seconds()) > 1:
-            # Start new group
-            current_group = {
-                'id': mod.id,
-                'user_id': mod.user_id,
-                'date': mod.date,
-                'user': mod.user,
-                'changes': [],
-                'total_changes': 0
-            }
-            grouped_modifications.append(current_group)
+        if group_date is None or abs((mod.date - group_date).total_seconds()) > 1:
+            group_date = mod.date
+            total_groups += 1
+            current_group = None
+            if total_groups > skip and (limit is None or total_groups <= skip + limit):
+                # Start new group
+                current_group = {
+                    'id': mod.id,
+                    'user_id': mod.user_id,
+                    'date': mod.date,
+                    'user': mod.user,
+                    'changes': [],
+                    'total_changes': 0
+                }
+                grouped_modifications.append(current_group)
+        if current_group is None:
+            continue
         
         # Add change description to current group
         if mod.field_name:
@@ -1478,105 +1540,83 @@ async def get_ticket_modifications(
             current_group['changes'].append(mod.reason)
             current_group['total_changes'] += 1
     
-    return GroupedModificationListResponse(modifications=grouped_modifications, total=len(grouped_modifications))
+    return GroupedModificationListResponse(modifications=grouped_modifications, total=total_groups)
+
+# Catalan labels for change descriptions, built once at import
+FIELD_DESCRIPTIONS = {
+    'ticket_num': 'El número de ticket',
+    'type': 'El tipus',
+    'title': 'El títol',
+    'description': 'La descripció',
+    'url': 'La URL',
+    'status_id': 'L\'estat',
+    'crit_id': 'La prioritat',
+    'center_id': 'El centre',
+    'tool_id': 'L\'eina',
+    'notifier': 'El notificador',
+    'people': 'Les persones implicades',
+    'pathway': 'La via de creació',
+    'attached': 'Els adjunts'
+}
+
+PATHWAY_LABELS = {
+    'web': 'Web',
+    'mobile': 'Mòbil',
+    'email': 'Email',
+    'phone': 'Telèfon',
+    'in_person': 'En persona'
+}
+
+def describe_reference_change(kind: str, message: str, removed_message: Optional[str] = None):
+    """Describer for a status/crit/center/tool id, resolved through the reference lookup tables"""
+    def describe(new_value: str, db: Session) -> Optional[str]:
+        entry = get_reference_entry(db, kind, int(new_value))
+        if entry:
+            return message.format(entry['desc'])
+        if removed_message and new_value == "0":
+            return removed_message
+        return None
+    return describe
+
+# One describer per tracked field; each gets a non-empty new value and may return None
+# to fall back to the generic description
+CHANGE_DESCRIBERS = {
+    'status_id': describe_reference_change('status', "L'estat s'ha canviat per {}"),
+    'crit_id': describe_reference_change('crit', "La prioritat ha passat a ser {}"),
+    'center_id': describe_reference_change('center', "El centre s'ha canviat per {}", "S'ha eliminat el centre"),
+    'tool_id': describe_reference_change('tool', "L'eina s'ha canviat per {}", "S'ha eliminat l'eina"),
+    'type': lambda value, db: f"El tipus s'ha canviat per {'Incidència' if value == 'incidence' else 'Suggeriment'}",
+    'title': lambda value, db: f"El títol s'ha canviat per \"{value}\"",
+    'description': lambda value, db: "La descripció s'ha actualitzat",
+    'ticket_num': lambda value, db: f"El número de ticket s'ha canviat per {value}",
+    'url': lambda value, db: f"La URL s'ha canviat per {value}",
+    'notifier': lambda value, db: f"El notificador s'ha canviat per {value}",
+    'people': lambda value, db: "Les persones implicades s'han actualitzat",
+    'pathway': lambda value, db: f"La via de creació s'ha canviat per {PATHWAY_LABELS.get(value, value)}",
+}
 
 def get_change_description(field_name: str, new_value: str, db: Session) -> str:
     """Generate natural language description of a field change in Catalan"""
-    field_descriptions = {
-        'ticket_num': 'El número de ticket',
-        'type': 'El tipus',
-        'title': 'El títol',
-        'description': 'La descripció',
-        'url': 'La URL',
-        'status_id': 'L\'estat',
-        'crit_id': 'La prioritat',
-        'center_id': 'El centre',
-        'tool_id': 'L\'eina',
-        'notifier': 'El notificador',
-        'people': 'Les persones implicades',
-        'pathway': 'La via de creació',
-        'attached': 'Els adjunts'
-    }
-    
-    field_desc = field_descriptions.get(field_name, field_name)
-    
-    # Get reference data for better descriptions
-    if field_name == 'status_id' and new_value:
-        status = db.query(Status).filter(Status.id == int(new_value)).first()
-        if status:
-            return f"L'estat s'ha canviat per {status.desc}"
-    
-    elif field_name == 'crit_id' and new_value:
-        crit = db.query(Crit).filter(Crit.id == int(new_value)).first()
-        if crit:
-            return f"La prioritat ha passat a ser {crit.desc}"
-    
-    elif field_name == 'center_id' and new_value:
-        center = db.query(Center).filter(Center.id == int(new_value)).first()
-        if center:
-            return f"El centre s'ha canviat per {center.desc}"
-        elif new_value == "0" or new_value == "":
-            return "S'ha eliminat el centre"
-    
-    elif field_name == 'tool_id' and new_value:
-        tool = db.query(Tool).filter(Tool.id == int(new_value)).first()
-        if tool:
-            return f"L'eina s'ha canviat per {tool.desc}"
-        elif new_value == "0" or new_value == "":
-            return "S'ha eliminat l'eina"
-    
-    elif field_name == 'type' and new_value:
-        type_desc = "Incidència" if new_value == "incidence" else "Suggeriment"
-        return f"El tipus s'ha canviat per {type_desc}"
-    
-    elif field_name == 'title' and new_value:
-        return f"El títol s'ha canviat per \"{new_value}\""
-    
-    elif field_name == 'description' and new_value:
-        return f"La descripció s'ha actualitzat"
-    
-    elif field_name == 'ticket_num' and new_value:
-        return f"El número de ticket s'ha canviat per {new_value}"
-    
-    elif field_name == 'url' and new_value:
-        if new_value:
-            return f"La URL s'ha canviat per {new_value}"
-        else:
-            return "S'ha eliminat la URL"
-    
-    elif field_name == 'notifier' and new_value:
-        if new_value:
-            return f"El notificador s'ha canviat per {new_value}"
-        else:
-            return "S'ha eliminat el notificador"
-    
-    elif field_name == 'people' and new_value:
-        return f"Les persones implicades s'han actualitzat"
-    
-    elif field_name == 'pathway' and new_value:
-        pathway_labels = {
-            'web': 'Web',
-            'mobile': 'Mòbil',
-            'email': 'Email',
-            'phone': 'Telèfon',
-            'in_person': 'En persona'
-        }
-        pathway_desc = pathway_labels.get(new_value, new_value)
-        return f"La via de creació s'ha canviat per {pathway_desc}"
-    
-    elif field_name == 'attached':
+    if field_name == 'attached':
         try:
             new_count = int(new_value) if new_value else 0
             return f"Els adjunts s'han actualitzat ({new_count} fitxer(s))"
         except (ValueError, TypeError):
             return "Els adjunts s'han actualitzat"
     
+    describe = CHANGE_DESCRIBERS.get(field_name)
+    if describe and new_value:
+        description = describe(new_value, db)
+        if description:
+            return description
+    
     # Fallback
+    field_desc = FIELD_DESCRIPTIONS.get(field_name, field_name)
     return f"{field_desc} s'ha canviat per {new_value}"
 
 # Comment endpoints
 @app.post("/tickets/{ticket_id}/comments", response_model=CommentModel)
-async def create_comment(
+def create_comment(
     ticket_id: str,
     comment: CommentCreate,
     current_user: User = Depends(get_current_complete_user),
@@ -1585,8 +1625,8 @@ async def create_comment(
     """Create a new comment on a ticket"""
     check_permission(current_user, 2)  # Level 2+ can post comments
     
-    # Verify ticket exists
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    # Verify ticket exists (id only, without loading the full row and its JSON columns)
+    ticket = db.query(Ticket.id).filter(Ticket.id == ticket_id).first()
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
     
@@ -1598,36 +1638,16 @@ async def create_comment(
     db_comment = Comment(
         ticket_id=ticket_id,
         user_id=current_user.id,
-        content=comment.content,
-        created_at=datetime.utcnow()
+        content=comment.content
     )
     db.add(db_comment)
     db.commit()
-    db.refresh(db_comment)
-    
-    # Return comment with user relationship loaded
-    db.refresh(db_comment)
-    # Manually load the user relationship
-    comment_dict = {
-        "id": db_comment.id,
-        "ticket_id": db_comment.ticket_id,
-        "user_id": db_comment.user_id,
-        "content": db_comment.content,
-        "created_at": db_comment.created_at.isoformat() if db_comment.created_at else None,
-        "user": {
-            "id": db_comment.user.id,
-            "username": db_comment.user.username,
-            "email": db_comment.user.email,
-            "name": db_comment.user.name,
-            "surnames": db_comment.user.surnames,
-            "permission_level": db_comment.user.permission_level,
-            "is_active": db_comment.user.is_active
-        }
-    }
-    return comment_dict
+    # The INSERT returns the generated id and created_at, so the object is
+    # returned as is
+    return db_comment
 
 @app.get("/tickets/{ticket_id}/comments", response_model=CommentListResponse)
-async def get_ticket_comments(
+def get_ticket_comments(
     ticket_id: str,
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
@@ -1638,52 +1658,68 @@ async def get_ticket_comments(
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
     
-    # Get comments ordered by newest first (descending)
-    comments = db.query(Comment).filter(Comment.ticket_id == ticket_id).order_by(Comment.created_at.desc()).all()
-    
-    # Convert to dictionaries with user information
-    comment_dicts = []
-    for comment in comments:
-        comment_dict = {
-            "id": comment.id,
-            "ticket_id": comment.ticket_id,
-            "user_id": comment.user_id,
-            "content": comment.content,
-            "created_at": comment.created_at.isoformat() if comment.created_at else None,
-            "user": {
-                "id": comment.user.id,
-                "username": comment.user.username,
-                "email": comment.user.email,
-                "name": comment.user.name,
-                "surnames": comment.user.surnames,
-                "permission_level": comment.user.permission_level,
-                "is_active": comment.user.is_active
-            }
-        }
-        comment_dicts.append(comment_dict)
+    # Get comments ordered by newest first (descending); the authors are loaded in one
+    # IN (...) query and the response models read both straight from the ORM objects
+    comments = db.execute(
+        select(Comment)
+        .options(selectinload(Comment.user))
+        .where(Comment.ticket_id == ticket_id)
+        .order_by(Comment.created_at.desc())
+    ).scalars().all()
     
-    return CommentListResponse(comments=comment_dicts, total=len(comment_dicts))
+    return CommentListResponse(comments=comments, total=len(comments))
+
+# Reference data only changes through the startup sync and /init-data, which bump
+# the version; the per-process seed keeps ETags from matching across restarts
+REFERENCE_ETAG_SEED = uuid.uuid4().hex[:8]
+_reference_version = 0
+
+def reference_data_cache(request: Request, response: Response):
+    """Cache validators for the reference lists, answering revalidations with 304"""
+    etag = f'W/"{REFERENCE_ETAG_SEED}-{_reference_version}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=300"}
+    if etag in request.headers.get("if-none-match", ""):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+# Reference data endpoints. The statements never change, so they are built once and
+# every request hits the same compiled-SQL cache entry
+STATUS_LIST_QUERY = select(Status)
+CRIT_LIST_QUERY = select(Crit)
+CENTER_LIST_QUERY = select(Center).order_by(Center.desc)
+TOOL_LIST_QUERY = select(Tool)
 
-# Reference data endpoints
-@app.get("/status/", response_model=List[StatusModel])
-async def get_statuses(db: Session = Depends(get_db)):
-    return db.query(Status).all()
+@app.get("/status/", response_model=List[StatusModel], dependencies=[Depends(reference_data_cache)])
+def get_statuses(db: Session = Depends(get_db)):
+    return db.execute(STATUS_LIST_QUERY).scalars().all()
 
-@app.get("/crit/", response_model=List[CritModel])
-async def get_crits(db: Session = Depends(get_db)):
-    return db.query(Crit).all()
+@app.get("/crit/", response_model=List[CritModel], dependencies=[Depends(reference_data_cache)])
+def get_crits(db: Session = Depends(get_db)):
+    return db.execute(CRIT_LIST_QUERY).scalars().all()
 
-@app.get("/center/", response_model=List[CenterModel])
-async def get_centers(db: Session = Depends(get_db)):
-    return db.query(Center).order_by(Center.desc).all()
+@app.get("/center/", response_model=List[CenterModel], dependencies=[Depends(reference_data_cache)])
+def get_centers(db: Session = Depends(get_db)):
+    return db.execute(CENTER_LIST_QUERY).scalars().all()
 
-@app.get("/tool/", response_model=List[ToolModel])
-async def get_tools(db: Session = Depends(get_db)):
-    return db.query(Tool).all()
+@app.get("/tool/", response_model=List[ToolModel], dependencies=[Depends(reference_data_cache)])
+def get_tools(db: Session = Depends(get_db)):
+    return db.execute(TOOL_LIST_QUERY).scalars().all()
+
+# Reference tables are keyed by their unique value column
+DIALECT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+def insert_missing_reference_rows(db: Session, model, rows: List[dict]):
+    """Insert the rows whose value isn't there yet, in a single statement where the dialect allows"""
+    dialect_insert = DIALECT_INSERTS.get(db.get_bind().dialect.name)
+    if dialect_insert is not None:
+        db.execute(dialect_insert(model).values(rows).on_conflict_do_nothing(index_elements=["value"]))
+        return
+    existing_values = {value for (value,) in db.query(model.value)}
+    db.add_all(model(**row) for row in rows if row["value"] not in existing_values)
 
 # Initialize reference data
 @app.post("/init-data")
-async def initialize_reference_data(db: Session = Depends(get_db)):
+def initialize_reference_data(db: Session = Depends(get_db)):
     # Initialize statuses
     statuses = [
         {"value": "created", "desc": "Creada"},
@@ -1698,11 +1734,7 @@ async def initialize_reference_data(db: Session = Depends(get_db)):
         {"value": "reopened", "desc": "Reoberta"}
     ]
     
-    for status_data in statuses:
-        existing = db.query(Status).filter(Status.value == status_data["value"]).first()
-        if not existing:
-            db_status = Status(**status_data)
-            db.add(db_status)
+    insert_missing_reference_rows(db, Status, statuses)
     
     # Initialize crits
     crits = [
@@ -1712,11 +1744,7 @@ async def initialize_reference_data(db: Session = Depends(get_db)):
         {"value": "critical", "desc": "Crítica"}
     ]
     
-    for crit_data in crits:
-        existing = db.query(Crit).filter(Crit.value == crit_data["value"]).first()
-        if not existing:
-            db_crit = Crit(**crit_data)
-            db.add(db_crit)
+    insert_missing_reference_rows(db, Crit, crits)
     
     # Initialize centers
     centers = [
@@ -1727,105 +1755,133 @@ async def initialize_reference_data(db: Session = Depends(get_db)):
         {"value": "281", "desc": "EAP Mataró- 7 (Ronda Prim)"}
     ]
     
-    for center_data in centers:
-        existing = db.query(Center).filter(Center.value == center_data["value"]).first()
-        if not existing:
-            db_center = Center(**center_data)
-            db.add(db_center)
+    insert_missing_reference_rows(db, Center, centers)
     
     db.commit()
+    invalidate_reference_caches()
     return {"message": "Reference data initialized successfully"}
 
+# Dashboard statistics are shared by every user, so one computed result is served
+# for a short while instead of re-running the aggregates on each dashboard load
+DASHBOARD_CACHE_TTL = 20  # seconds
+_dashboard_cache: Optional[tuple] = None  # (expires_at, statistics)
+# Bumped on every invalidation so a computation that overlapped a ticket change
+# doesn't store its pre-change result
+_dashboard_generation = 0
+_dashboard_lock = threading.Lock()
+
+def invalidate_dashboard_cache():
+    """Drop the cached dashboard statistics after tickets change"""
+    global _dashboard_cache, _dashboard_generation
+    with _dashboard_lock:
+        _dashboard_generation += 1
+        _dashboard_cache = None
+
 # Dashboard statistics endpoint
 @app.get("/dashboard/statistics")
-async def get_dashboard_statistics(
+def get_dashboard_statistics(
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
 ):
     """Get dashboard statistics including ticket counts, distributions, and trends"""
-    from datetime import date, timedelta
+    global _dashboard_cache
+    now = time.monotonic()
+    cached = _dashboard_cache
+    if cached is not None and cached[0] > now:
+        return cached[1]
     
-    # Total tickets (excluding deleted)
-    total_tickets = db.query(Ticket).filter(
+    generation = _dashboard_generation
+    try:
+        statistics = compute_dashboard_statistics(db)
+    except SQLAlchemyError:
+        if cached is None:
+            raise
+        # Serve the last known statistics rather than failing the dashboard
+        logger.exception("Dashboard statistics query failed; serving cached result")
+        return cached[1]
+    
+    with _dashboard_lock:
+        if _dashboard_generation == generation:
+            _dashboard_cache = (now + DASHBOARD_CACHE_TTL, statistics)
+    return statistics
+
+def compute_dashboard_statistics(db: Session) -> dict:
+    """Run the dashboard aggregates against the database"""
+    # Total and open tickets (excluding deleted) in one pass; open means not solved,
+    # closed, deleted or discarded
+    open_status_ids = get_open_status_ids(db)
+    total_tickets, open_tickets = db.query(
+        func.count(),
+        func.count(case((Ticket.status_id.in_(open_status_ids), 1)))
+    ).filter(
         Ticket.delete_date.is_(None)
-    ).count()
+    ).one()
     
     # Tickets by type
-    tickets_by_type = db.query(
+    type_distribution = dict(db.query(
         Ticket.type,
         func.count(Ticket.id).label('count')
     ).filter(
         Ticket.delete_date.is_(None)
-    ).group_by(Ticket.type).all()
-    type_distribution = {t[0]: t[1] for t in tickets_by_type}
+    ).group_by(Ticket.type))
     
     # Tickets by criticality
-    tickets_by_crit = db.query(
+    crit_distribution = dict(db.query(
         Crit.desc,
         func.count(Ticket.id).label('count')
     ).join(
         Ticket, Ticket.crit_id == Crit.id
     ).filter(
         Ticket.delete_date.is_(None)
-    ).group_by(Crit.id, Crit.desc).all()
-    crit_distribution = {c[0]: c[1] for c in tickets_by_crit}
+    ).group_by(Crit.id, Crit.desc))
     
     # Tickets by status
-    tickets_by_status = db.query(
+    status_distribution = dict(db.query(
         Status.desc,
         func.count(Ticket.id).label('count')
     ).join(
         Ticket, Ticket.status_id == Status.id
     ).filter(
         Ticket.delete_date.is_(None)
-    ).group_by(Status.id, Status.desc).all()
-    status_distribution = {s[0]: s[1] for s in tickets_by_status}
+    ).group_by(Status.id, Status.desc))
     
     # Tickets by center
-    tickets_by_center = db.query(
+    center_distribution = dict(db.query(
         Center.desc,
         func.count(Ticket.id).label('count')
     ).join(
         Ticket, Ticket.center_id == Center.id
     ).filter(
         Ticket.delete_date.is_(None)
-    ).group_by(Center.id, Center.desc).all()
-    center_distribution = {c[0]: c[1] for c in tickets_by_center}
-    
-    # Active users count
-    active_users = db.query(User).filter(User.is_active == True).count()
-    total_users = db.query(User).count()
-    
-    # Tickets created in last 30 days (for trend)
-    thirty_days_ago = date.today() - timedelta(days=30)
+    ).group_by(Center.id, Center.desc))
+    
+    # Active and total users count
+    active_users, total_users = db.query(
+        func.count(case((User.is_active == True, 1))),
+        func.count(User.id)
+    ).one()
+    
+    # Tickets created in last 30 days (for trend). creation_date is already a DATE, so
+    # grouping on the bare column follows the live-ticket creation_date index
+    today = date.today()
+    thirty_days_ago = today - timedelta(days=30)
     recent_tickets = db.query(
-        func.date(Ticket.creation_date).label('date'),
-        func.count(Ticket.id).label('count')
+        Ticket.creation_date,
+        func.count()
     ).filter(
         Ticket.creation_date >= thirty_days_ago,
         Ticket.delete_date.is_(None)
-    ).group_by(func.date(Ticket.creation_date)).order_by(
-        func.date(Ticket.creation_date)
-    ).all()
-    
-    # Format recent tickets for chart
-    tickets_trend = [
-        {"date": str(t[0]), "count": t[1]}
-        for t in recent_tickets
-    ]
+    ).group_by(Ticket.creation_date)
+    counts_by_day = {str(day): count for day, count in recent_tickets}
     
-    # Open tickets (not solved, closed, or deleted)
-    open_statuses = db.query(Status).filter(
-        ~Status.value.in_(['solved', 'closed', 'deleted', 'discarted'])
-    ).all()
-    open_status_ids = [s.id for s in open_statuses]
-    open_tickets = db.query(Ticket).filter(
-        Ticket.status_id.in_(open_status_ids),
-        Ticket.delete_date.is_(None)
-    ).count()
+    # Format recent tickets for chart: one entry per day, zero when nothing was created
+    tickets_trend = []
+    for offset in range(31):
+        day = str(thirty_days_ago + timedelta(days=offset))
+        tickets_trend.append({"date": day, "count": counts_by_day.get(day, 0)})
     
     # Tickets by tool
-    tickets_by_tool = db.query(
+    tool_distribution = dict(db.query(
         Tool.desc,
         func.count(Ticket.id).label('count')
     ).join(
@@ -1834,8 +1890,7 @@ async def get_dashboard_statistics(
         Ticket.delete_date.is_(None)
     ).group_by(Tool.id, Tool.desc).order_by(
         func.count(Ticket.id).desc()
-    ).limit(10).all()
-    tool_distribution = {t[0]: t[1] for t in tickets_by_tool}
+    ).limit(10))
     
     return {
         "total_tickets": total_tickets,
@@ -1852,7 +1907,7 @@ async def get_dashboard_statistics(
 
 # File migration endpoint
 @app.post("/migrate-files")
-async def migrate_files_to_new_structure(
+def migrate_files_to_new_structure(
     current_user: User = Depends(get_current_complete_user),
     db: Session = Depends(get_db)
 ):
@@ -1875,16 +1930,14 @@ def cleanup_empty_directories(ticket_id: str, file_path: str):
             current_dir = os.path.join(UPLOADS_DIR, *path_parts[:-1])  # Exclude filename
             
             while current_dir != os.path.join(UPLOADS_DIR, "tickets", ticket_id):
-                if os.path.exists(current_dir) and os.path.isdir(current_dir):
-                    try:
-                        # Check if directory is empty
-                        if not os.listdir(current_dir):
-                            os.rmdir(current_dir)
-                            print(f"DEBUG: Removed empty directory: {current_dir}")
-                        else:
-                            break  # Directory not empty, stop cleanup
-                    except OSError:
-                        break  # Can't remove directory, stop cleanup
+                # rmdir only succeeds on an empty directory, so try it directly
+                try:
+                    os.rmdir(current_dir)
+                    logger.debug("Removed empty directory: %s", current_dir)
+                except FileNotFoundError:
+                    pass  # Already gone, keep walking up
+                except OSError:
+                    break  # Directory not empty (or can't be removed), stop cleanup
                 
                 # Move up one level
                 current_dir = os.path.dirname(current_dir)
@@ -1893,78 +1946,95 @@ def cleanup_empty_directories(ticket_id: str, file_path: str):
                 if not current_dir.startswith(os.path.join(UPLOADS_DIR, "tickets")):
                     break
     except Exception as e:
-        print(f"DEBUG: Error in cleanup_empty_directories: {e}")
+        logger.warning("Error in cleanup_empty_directories: %s", e)
+
+MIGRATION_BATCH_SIZE = 500  # tickets per commit in migrate_existing_files_to_new_structure
 
 def migrate_existing_files_to_new_structure(db: Session):
     """Migrate existing files from old structure to new ticket-based structure"""
     try:
-        print("🔄 Starting file migration to new structure...")
+        logger.info("Starting file migration to new structure")
         
-        # Get all tickets with attachments
-        tickets = db.query(Ticket).filter(Ticket.attached.isnot(None)).all()
+        # Get the ids of all tickets with attachments, then load and commit them in batches
+        ticket_ids = [row.id for row in db.query(Ticket.id).filter(Ticket.attached.isnot(None))]
+        ensured_dirs = set()
         
-        for ticket in tickets:
-            if not ticket.attached:
-                continue
-                
-            print(f"🔄 Processing ticket {ticket.id} with {len(ticket.attached)} attachments")
+        for batch_start in range(0, len(ticket_ids), MIGRATION_BATCH_SIZE):
+            batch_ids = ticket_ids[batch_start:batch_start + MIGRATION_BATCH_SIZE]
+            tickets = db.query(Ticket).filter(Ticket.id.in_(batch_ids)).all()
             
-            updated_attachments = []
-            for attachment in ticket.attached:
-                old_path = attachment.get("path", "")
-                
-                # Skip if already in new structure
-                if old_path.startswith("tickets/"):
-                    updated_attachments.append(attachment)
+            for ticket in tickets:
+                if not ticket.attached:
                     continue
-                
-                # Parse old path (format: YYYY/MM/filename)
-                if "/" in old_path and len(old_path.split("/")) == 2:
-                    year_month, filename = old_path.split("/", 1)
                     
-                    # Create new path structure
-                    new_path = f"tickets/{ticket.id}/attachments/{year_month}/{filename}"
-                    
-                    # Create new directory structure
-                    new_dir = os.path.join(UPLOADS_DIR, "tickets", ticket.id, "attachments", year_month)
-                    os.makedirs(new_dir, exist_ok=True)
+                logger.debug("Processing ticket %s with %d attachments", ticket.id, len(ticket.attached))
+                
+                updated_attachments = []
+                moved = False
+                for attachment in ticket.attached:
+                    old_path = attachment.get("path", "")
                     
-                    # Move file if it exists
-                    old_file_path = os.path.join(UPLOADS_DIR, old_path)
-                    new_file_path = os.path.join(UPLOADS_DIR, new_path)
+                    # Skip if already in new structure
+                    if old_path.startswith("tickets/"):
+                        updated_attachments.append(attachment)
+                        continue
                     
-                    if os.path.exists(old_file_path):
+                    # Parse old path (format: YYYY/MM/filename)
+                    if "/" in old_path and len(old_path.split("/")) == 2:
+                        year_month, filename = old_path.split("/", 1)
+                        
+                        # Create new path structure
+                        new_path = f"tickets/{ticket.id}/attachments/{year_month}/{filename}"
+                        
+                        # Create new directory structure (once per directory)
+                        new_dir = os.path.join(UPLOADS_DIR, "tickets", ticket.id, "attachments", year_month)
+                        if new_dir not in ensured_dirs:
+                            os.makedirs(new_dir, exist_ok=True)
+                            ensured_dirs.add(new_dir)
+                        
+                        # Move file if it exists
+                        old_file_path = os.path.join(UPLOADS_DIR, old_path)
+                        new_file_path = os.path.join(UPLOADS_DIR, new_path)
+                        
                         try:
-                            shutil.move(old_file_path, new_file_path)
-                            print(f"✅ Moved file: {old_path} -> {new_path}")
-                            
-                            # Update attachment record
-                            attachment["path"] = new_path
-                            updated_attachments.append(attachment)
-                        except Exception as e:
-                            print(f"❌ Error moving file {old_path}: {e}")
-                            # Keep old attachment if move fails
+                            # Same filesystem: a single rename, no exists/stat calls first
+                            os.rename(old_file_path, new_file_path)
+                        except FileNotFoundError:
+                            logger.warning("File not found: %s", old_file_path)
+                            # Keep old attachment if file doesn't exist
                             updated_attachments.append(attachment)
+                            continue
+                        except OSError:
+                            # Across filesystems: copy and delete
+                            try:
+                                shutil.move(old_file_path, new_file_path)
+                            except Exception as e:
+                                logger.error("Error moving file %s: %s", old_path, e)
+                                # Keep old attachment if move fails
+                                updated_attachments.append(attachment)
+                                continue
+                        logger.debug("Moved file: %s -> %s", old_path, new_path)
+                        
+                        # Update attachment record
+                        updated_attachments.append({**attachment, "path": new_path})
+                        moved = True
                     else:
-                        print(f"⚠️ File not found: {old_file_path}")
-                        # Keep old attachment if file doesn't exist
+                        # Invalid path format, keep as is
                         updated_attachments.append(attachment)
-                else:
-                    # Invalid path format, keep as is
-                    updated_attachments.append(attachment)
+                
+                # Update ticket with new attachment paths
+                if moved:
+                    ticket.attached = updated_attachments
+                    flag_modified(ticket, "attached")
+                    logger.debug("Updated ticket %s attachments", ticket.id)
             
-            # Update ticket with new attachment paths
-            if updated_attachments != ticket.attached:
-                ticket.attached = updated_attachments
-                flag_modified(ticket, "attached")
-                print(f"✅ Updated ticket {ticket.id} attachments")
+            # Commit each batch so memory and the open transaction stay bounded
+            db.commit()
         
-        # Commit all changes
-        db.commit()
-        print("✅ File migration completed successfully")
+        logger.info("File migration completed successfully")
         
-    except Exception as e:
-        print(f"❌ Error during file migration: {e}")
+    except Exception:
+        logger.exception("Error during file migration")
         db.rollback()
         raise
 
@@ -81,6 +81,15 @@ def reload_config(config_name: str = None):
         config_manager.reload_config()
         print("✅ All configuration files reloaded")
 
+def compile_configs():
+    """Precompile configuration files into a Python module"""
+    print("Compiling configuration files...")
+    try:
+        compiled_file = config_manager.compile_configs()
+        print(f"✅ Compiled configuration written to {compiled_file}")
+    except Exception as e:
+        print(f"Error compiling configuration files: {e}")
+
 def create_sample_config(config_name: str):
     """Create a sample configuration file"""
     sample_data = {
@@ -134,6 +143,7 @@ def main():
         print("  python manage_config.py show <config_name>      - Show config content")
         print("  python manage_config.py reload [config_name]    - Reload config files")
         print("  python manage_config.py create <config_name>    - Create sample config")
+        print("  python manage_config.py compile                 - Precompile config files")
         return
     
     command = sys.argv[1]
@@ -166,6 +176,9 @@ def main():
             return
         create_sample_config(sys.argv[2])
     
+    elif command == "compile":
+        compile_configs()
+    
     else:
         print(f"Unknown command: {command}")
         print("Use 'python manage_config.py' for help")
@@ -48,6 +48,16 @@ class User(UserBase):
     
     model_config = ConfigDict(from_attributes=True)
 
+class UserListItem(BaseModel):
+    """Lean user entry for the notifier dropdowns"""
+    id: int
+    username: str
+    name: Optional[str] = None
+    surnames: Optional[str] = None
+    permission_level: int
+    
+    model_config = ConfigDict(from_attributes=True)
+
 # Ticket models
 class FileAttachment(BaseModel):
     filename: str
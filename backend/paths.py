@@ -0,0 +1,11 @@
+"""
+Filesystem locations shared by the backend modules and scripts
+"""
+
+from pathlib import Path
+
+# Directory containing the backend sources, resolved once at import
+HERE = Path(__file__).resolve().parent
+DB_PATH = HERE / "ticket_manager.db"
+CONFIG_DIR = HERE / "config"
+UPLOADS_DIR = HERE / "uploads"
@@ -1,12 +1,11 @@
-import random
-import string
+import secrets
+import time
 from sqlalchemy.orm import Session
 from database import Ticket
 
 def generate_hex_digits(length: int = 6) -> str:
-    """Generate random hexadecimal digits"""
-    hex_chars = string.hexdigits.upper()[:-6]  # A-F, 0-9 (exclude lowercase)
-    return ''.join(random.choice(hex_chars) for _ in range(length))
+    """Generate random uppercase hexadecimal digits"""
+    return secrets.token_hex((length + 1) // 2)[:length].upper()
 
 def generate_ticket_id(ticket_type: str, db: Session) -> str:
     """
@@ -42,7 +41,6 @@ def generate_ticket_id(ticket_type: str, db: Session) -> str:
         attempts += 1
     
     # If we've tried too many times, add a timestamp to ensure uniqueness
-    import time
     timestamp = int(time.time() % 1000000)  # Last 6 digits of timestamp
     hex_timestamp = f"{timestamp:06X}"  # Convert to 6-digit hex
     return f"{prefix}{hex_timestamp}"